@@ -6,23 +6,106 @@ Compliant with UAE Federal Decree Law No. 33 of 2021 on Employment Relationships
 
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Tuple
+import numpy as np
+from datetime import datetime, date, timedelta
+from dataclasses import dataclass, field, fields
+from typing import List, Optional, Dict, Tuple, NamedTuple, Union
+import atexit
 import json
 import os
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from operator import attrgetter
 import hashlib
+import heapq
+import hmac
+import io
 import secrets
 import re
+import string
+import sys
+import tempfile
+import threading
 import time
+import zipfile
+from types import MappingProxyType
+
+try:
+    import orjson  # Optional: faster JSON encoding/decoding when installed
+except ImportError:
+    orjson = None
+
+# Partial reruns for self-contained widget groups: st.fragment (Streamlit >= 1.37,
+# st.experimental_fragment before); older versions run them with the whole page
+fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+try:
+    import python_calamine  # Optional: faster Excel reading for bulk imports (pandas >= 2.2)
+except ImportError:
+    python_calamine = None
+
+# pandas only gained the calamine engine in 2.2; older versions keep their default engine
+EXCEL_ENGINE = (
+    "calamine"
+    if python_calamine is not None and tuple(map(int, re.findall(r"\d+", pd.__version__)[:2])) >= (2, 2)
+    else None
+)
 
 # ============== CONFIGURATION ==============
 DATA_FILE = "leave_data.json"
 EMPLOYEES_FILE = "employees.json"
 USERS_FILE = "users.json"
+# Seconds to coalesce low-value user writes (e.g. last login) before saving
+DEFERRED_WRITE_SECONDS = 5.0
+
+
+def _json_default(obj):
+    """Serialize records (Employee, User, LeaveRequest) through their to_dict()"""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_dumps(data) -> bytes:
+    """Serialize data (records are converted lazily) to indented UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(
+            data, default=_json_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+    return json.dumps(data, indent=2, default=_json_default).encode("utf-8")
+
+
+def _json_loads(raw: bytes):
+    """Parse JSON from raw bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
 # ============== AUTHENTICATION & USER ROLES ==============
+# scrypt work factors for password hashing (stored with each hash so they can be raised later)
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# Usernames: at least 4 letters, digits or underscores
+_USERNAME_RE = re.compile(r'\A[A-Za-z0-9_]{4,}\Z')
+
+# Password policy for self-service password changes
+PASSWORD_MIN_LENGTH = 8
+_PASSWORD_SPECIAL_CHARS = frozenset("!@#$%^&*")
+# Any character three times in a row (e.g. "aaa", "111")
+_PASSWORD_REPEAT_RE = re.compile(r'(.)\1\1', re.DOTALL)
+
+# Temporary password alphabet; random bytes past the last full multiple of its
+# length are discarded so every character is equally likely
+TEMP_PASSWORD_LENGTH = 12
+_TEMP_PASSWORD_CHARS = string.ascii_letters + string.digits + "!@#$%^&*"
+_TEMP_PASSWORD_TABLE = bytes(ord(_TEMP_PASSWORD_CHARS[b % len(_TEMP_PASSWORD_CHARS)]) for b in range(256))
+_TEMP_PASSWORD_REJECT = bytes(range(256 - 256 % len(_TEMP_PASSWORD_CHARS), 256))
+
 USER_ROLES = {
     "employee": "Employee - Can submit leave requests and view own data",
     "admin": "Admin/HR - First level approval, user management, reports",
@@ -37,8 +120,40 @@ APPROVAL_WORKFLOW = {
     "Cancelled": "Cancelled",
 }
 
+# Statuses that still occupy the calendar and count towards conflicts
+ACTIVE_STATUSES = frozenset({"Pending", "Admin_Approved", "Manager_Approved"})
+# Statuses a manager can still act on (final approval or rejection)
+AWAITING_FINAL_STATUSES = frozenset({"Pending", "Admin_Approved"})
+# Month names indexed by month - 1, so reports don't format a date per row just for "%B"
+MONTH_NAMES = ("January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December")
+# Per-status (icon, colour, description) for the employee's request cards
+STATUS_CONFIG = MappingProxyType({
+    "Pending": ("⏳", "#FF9800", "Awaiting Admin/HR Review"),
+    "Admin_Approved": ("✅", "#4CAF50", "Approved by Admin - Awaiting Manager"),
+    "Manager_Approved": ("🎉", "#2196F3", "Fully Approved"),
+    "Rejected": ("❌", "#F44336", "Rejected"),
+    "Cancelled": ("🚫", "#9E9E9E", "Cancelled"),
+})
+UNKNOWN_STATUS_CONFIG = ("❓", "#999999", "Unknown")
+# Choices for the Action column of the approval tables, per approving role
+APPROVAL_NO_ACTION = "—"
+APPROVAL_ACTIONS = MappingProxyType({
+    "admin": (APPROVAL_NO_ACTION, "Approve", "Reject"),
+    "manager": (APPROVAL_NO_ACTION, "Final Approve", "Reject"),
+})
+# Status badges shown in the approval lists
+STATUS_BADGES = MappingProxyType({
+    "Pending": "🟡 Pending",
+    "Admin_Approved": "🟢 Admin Approved",
+    "Manager_Approved": "🔵 Fully Approved",
+    "Rejected": "🔴 Rejected",
+    "Cancelled": "⚪ Cancelled",
+})
+
 # UAE Labour Law Constants (Federal Decree Law No. 33 of 2021)
-UAE_LEAVE_ENTITLEMENTS = {
+# Reference tables are wrapped read-only so the shared values can't drift between reruns/sessions
+UAE_LEAVE_ENTITLEMENTS = MappingProxyType({
     "annual_leave_full": 30,  # Days after 1 year of service
     "annual_leave_partial": 2,  # Days per month after 6 months but < 1 year
     "maternity_leave": 60,  # 45 full pay + 15 half pay
@@ -49,7 +164,7 @@ UAE_LEAVE_ENTITLEMENTS = {
     "sick_leave_full": 15,  # Full pay days
     "sick_leave_half": 30,  # Half pay days
     "sick_leave_total": 90,  # Total sick leave days
-}
+})
 
 LEAVE_TYPES = {
     "Annual Leave": {
@@ -173,10 +288,39 @@ LEAVE_TYPES = {
         "calendar_days": True,
     },
 }
+LEAVE_TYPES = MappingProxyType({name: MappingProxyType(info) for name, info in LEAVE_TYPES.items()})
+LEAVE_TYPE_NAMES = tuple(LEAVE_TYPES)
+# Selectbox labels for the leave types ("name - description")
+LEAVE_TYPE_LABELS = MappingProxyType({name: f"{name} - {info['description']}" for name, info in LEAVE_TYPES.items()})
+# Leave types counted in working days per UAE law; all others use calendar days
+WORKING_DAY_LEAVE_TYPES = frozenset({"Parental Leave", "Study Leave"})
 
 
 # ============== DATA CLASSES ==============
-@dataclass
+# Slotted records (Python 3.10+) drop the per-instance __dict__
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _intern_fields(data: Dict, names: Tuple[str, ...]) -> Dict:
+    """Intern low-cardinality string values so records share one copy of each"""
+    for name in names:
+        value = data.get(name)
+        if isinstance(value, str):
+            data[name] = sys.intern(value)
+    return data
+
+# Dates accepted by LeaveCalculator: ISO strings (YYYY-MM-DD) or date/datetime objects
+DateLike = Union[str, date]
+
+
+def _to_ordinal(value: DateLike) -> int:
+    """Convert an ISO date string (YYYY-MM-DD) or date to a day ordinal"""
+    if isinstance(value, date):
+        return value.toordinal()
+    return date.fromisoformat(value).toordinal()
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Employee:
     id: str
     name: str
@@ -210,10 +354,11 @@ class Employee:
         # Filter out keys that are not in the class
         valid_keys = {field.name for field in cls.__dataclass_fields__.values()}
         filtered_data = {k: v for k, v in data.items() if k in valid_keys}
+        _intern_fields(filtered_data, ("department", "position", "employment_type", "status", "nationality", "gender"))
         return cls(**filtered_data)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class User:
     """User account for authentication"""
     username: str
@@ -247,39 +392,93 @@ class AuthManager:
     
     @staticmethod
     def hash_password(password: str, salt: str = None) -> Tuple[str, str]:
-        """Hash password with salt"""
+        """Hash password with salt using scrypt"""
         if salt is None:
             salt = secrets.token_hex(16)
-        salted_password = password + salt
-        password_hash = hashlib.sha256(salted_password.encode()).hexdigest()
-        return password_hash, salt
+        digest = hashlib.scrypt(
+            password.encode(), salt=bytes.fromhex(salt),
+            n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=32
+        )
+        return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${digest.hex()}", salt
+    
+    @staticmethod
+    def hash_passwords(passwords: List[str]) -> List[Tuple[str, str]]:
+        """Hash many passwords in parallel (scrypt releases the GIL)"""
+        if len(passwords) < 2:
+            return [AuthManager.hash_password(password) for password in passwords]
+        with ThreadPoolExecutor() as pool:
+            return list(pool.map(AuthManager.hash_password, passwords))
     
     @staticmethod
     def verify_password(password: str, password_hash: str, salt: str) -> bool:
-        """Verify password against hash"""
-        salted_password = password + salt
-        return hashlib.sha256(salted_password.encode()).hexdigest() == password_hash
+        """Verify password against hash (scrypt, or legacy salted SHA-256)"""
+        if password_hash.startswith("scrypt$"):
+            try:
+                _, n, r, p, expected = password_hash.split("$")
+                digest = hashlib.scrypt(
+                    password.encode(), salt=bytes.fromhex(salt),
+                    n=int(n), r=int(r), p=int(p), dklen=len(expected) // 2
+                ).hex()
+            except ValueError:
+                return False
+        else:
+            expected = password_hash
+            digest = hashlib.sha256((password + salt).encode()).hexdigest()
+        # Compare as bytes: compare_digest rejects non-ASCII str, e.g. a corrupted stored hash
+        return hmac.compare_digest(digest.encode(), expected.encode())
+    
+    @staticmethod
+    def needs_rehash(password_hash: str) -> bool:
+        """Check if a stored hash predates the current scrypt parameters"""
+        return not password_hash.startswith(f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
     
     @staticmethod
     def generate_temporary_password() -> str:
         """Generate a secure temporary password"""
-        import random
-        import string
-        # Generate 10-character password with mixed case, numbers, and symbols
-        chars = string.ascii_letters + string.digits + "!@#$%^&*"
-        return ''.join(random.choice(chars) for _ in range(12))
+        # Map CSPRNG bytes onto letters, digits and symbols in one translate call
+        password = b""
+        while len(password) < TEMP_PASSWORD_LENGTH:
+            password += secrets.token_bytes(TEMP_PASSWORD_LENGTH + 4).translate(
+                _TEMP_PASSWORD_TABLE, _TEMP_PASSWORD_REJECT
+            )
+        return password[:TEMP_PASSWORD_LENGTH].decode()
+    
+    @staticmethod
+    def password_policy_errors(password: str) -> List[str]:
+        """List every password policy rule the password fails"""
+        # Test each character class over the distinct characters with C-level map/isdisjoint
+        chars = set(password)
+        has_upper = any(map(str.isupper, chars))
+        has_lower = any(map(str.islower, chars))
+        has_digit = any(map(str.isdigit, chars))
+        has_special = not _PASSWORD_SPECIAL_CHARS.isdisjoint(chars)
+        
+        errors = []
+        if len(password) < PASSWORD_MIN_LENGTH:
+            errors.append(f"New password must be at least {PASSWORD_MIN_LENGTH} characters long.")
+        if not has_upper:
+            errors.append("Password must include at least one uppercase letter.")
+        if not has_lower:
+            errors.append("Password must include at least one lowercase letter.")
+        if not has_digit:
+            errors.append("Password must include at least one number.")
+        if not has_special:
+            errors.append("Password must include at least one special character (!@#$%^&*).")
+        if _PASSWORD_REPEAT_RE.search(password):
+            errors.append("Password must not repeat the same character three times in a row.")
+        return errors
     
     @staticmethod
     def validate_username(username: str) -> Tuple[bool, str]:
         """Validate username format"""
+        if _USERNAME_RE.match(username):
+            return True, "Valid"
         if len(username) < 4:
             return False, "Username must be at least 4 characters"
-        if not re.match(r'^[a-zA-Z0-9_]+$', username):
-            return False, "Username can only contain letters, numbers, and underscores"
-        return True, "Valid"
+        return False, "Username can only contain letters, numbers, and underscores"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LeaveRequest:
     id: str
     employee_id: str
@@ -307,6 +506,33 @@ class LeaveRequest:
     approved_by: Optional[str] = None
     approval_date: Optional[str] = None
     remarks: str = ""
+    # Parsed date cache as (source string, ordinal) - not persisted
+    _start_cache: Optional[Tuple[str, int]] = field(default=None, init=False, repr=False, compare=False)
+    _end_cache: Optional[Tuple[str, int]] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def start_ord(self) -> int:
+        """start_date as a day ordinal, re-parsed only when the string changes"""
+        if self._start_cache is None or self._start_cache[0] is not self.start_date:
+            self._start_cache = (self.start_date, _to_ordinal(self.start_date))
+        return self._start_cache[1]
+    
+    @property
+    def end_ord(self) -> int:
+        """end_date as a day ordinal, re-parsed only when the string changes"""
+        if self._end_cache is None or self._end_cache[0] is not self.end_date:
+            self._end_cache = (self.end_date, _to_ordinal(self.end_date))
+        return self._end_cache[1]
+    
+    @property
+    def start_dt(self) -> datetime:
+        """start_date as a midnight datetime, built from the cached ordinal (no string parsing)"""
+        return datetime.fromordinal(self.start_ord)
+    
+    @property
+    def end_dt(self) -> datetime:
+        """end_date as a midnight datetime, built from the cached ordinal (no string parsing)"""
+        return datetime.fromordinal(self.end_ord)
     
     def to_dict(self):
         return {
@@ -347,237 +573,534 @@ class LeaveRequest:
             data["manager_approved_by"] = None
             data["manager_approval_date"] = None
             data["manager_remarks"] = ""
-        return cls(**data)
+        _intern_fields(data, (
+            "employee_id", "employee_name", "leave_type", "status", "submitted_by",
+            "admin_approved_by", "manager_approved_by", "approved_by",
+        ))
+        request = cls(**data)
+        # Warm the date cache so conflict checks never parse on the hot path
+        _ = request.start_ord, request.end_ord
+        return request
+
+
+# Sample employees created on first run and after a reset:
+# (id, name, email, department, position, join_date)
+SAMPLE_EMPLOYEES = (
+    ("EMP001", "Ahmed Hassan", "ahmed@company.com", "Engineering", "Senior Developer", "2020-03-15"),
+    ("EMP002", "Fatima Al Zahra", "fatima@company.com", "Engineering", "Software Engineer", "2021-06-01"),
+    ("EMP003", "Mohammed Ali", "mohammed@company.com", "Engineering", "DevOps Engineer", "2019-11-20"),
+    ("EMP004", "Sarah Johnson", "sarah@company.com", "HR", "HR Manager", "2018-01-10"),
+    ("EMP005", "Omar Farooq", "omar@company.com", "HR", "HR Specialist", "2022-03-01"),
+    ("EMP006", "Layla Mahmoud", "layla@company.com", "Finance", "Finance Manager", "2017-08-15"),
+    ("EMP007", "Khalid Ibrahim", "khalid@company.com", "Finance", "Accountant", "2021-02-14"),
+    ("EMP008", "Aisha Noor", "aisha@company.com", "Marketing", "Marketing Director", "2019-05-20"),
+    ("EMP009", "Yusuf Khan", "yusuf@company.com", "Marketing", "Marketing Specialist", "2023-01-15"),
+    ("EMP010", "Zainab Omar", "zainab@company.com", "Operations", "Operations Manager", "2020-09-01"),
+)
+
+# Default accounts created alongside them: (username, password, employee_id, role)
+DEFAULT_ACCOUNTS = (
+    ("admin", "admin123", "EMP004", "admin"),  # Sarah Johnson - HR Manager
+    ("manager", "manager123", "EMP006", "manager"),  # Layla Mahmoud - Finance Manager
+    ("ahmed.hassan", "employee123", "EMP001", "employee"),
+    ("fatima.zahra", "employee123", "EMP002", "employee"),
+    ("mohammed.ali", "employee123", "EMP003", "employee"),
+)
+
+
+@st.cache_resource(show_spinner=False)
+def get_default_account_hashes() -> Tuple[Tuple[str, str], ...]:
+    """(password_hash, salt) per DEFAULT_ACCOUNTS entry, hashed once per server process
+    
+    Every reset reuses these, so default accounts share a salt across resets. That costs
+    nothing: the default passwords are published in the docs and on the reset screen.
+    """
+    return tuple(AuthManager.hash_passwords([password for _, password, _, _ in DEFAULT_ACCOUNTS]))
 
 
 # ============== DATA MANAGEMENT ==============
+class LeaveIntervalIndex(NamedTuple):
+    """Active leave intervals as parallel arrays, sorted by end date"""
+    starts: np.ndarray  # int64 start day ordinals
+    ends: np.ndarray  # int64 end day ordinals (ascending)
+    employee_codes: np.ndarray  # int64 employee codes, see employee_code_of
+    positions: np.ndarray  # index into requests (insertion order)
+    requests: List[Tuple[str, "LeaveRequest"]]  # (request_id, LeaveRequest)
+    employee_code_of: Dict[str, int]  # employee_id -> code
+    base_ord: int  # day ordinal of bit 0 in the occupancy bitmaps
+    occupancy: Dict[str, int]  # employee_id -> bitmap of days on active leave
+
+
+def _day_mask(start_ord: int, end_ord: int, base_ord: int) -> int:
+    """Bitmap with one bit set per day in [start_ord, end_ord], bit 0 being base_ord"""
+    start_ord = max(start_ord, base_ord)
+    if end_ord < start_ord:
+        return 0
+    return ((1 << (end_ord - start_ord + 1)) - 1) << (start_ord - base_ord)
+
+
 class DataManager:
     def __init__(self):
         self.employees: Dict[str, Employee] = {}
         self.leave_requests: Dict[str, LeaveRequest] = {}
         self.users: Dict[str, User] = {}
+        # Leave request buckets: status -> {id: request}, employee -> {id: request} (active only)
+        self._by_status: Dict[str, Dict[str, LeaveRequest]] = defaultdict(dict)
+        self._active_by_employee: Dict[str, Dict[str, LeaveRequest]] = defaultdict(dict)
+        self._by_employee: Dict[str, Dict[str, LeaveRequest]] = defaultdict(dict)
+        # Sorted interval index and DataFrame mirror of leave requests (built lazily)
+        self._interval_index = None
+        self._requests_frame = None
+        # Sorted department names and employee id -> department (built lazily, dropped whenever employees change)
+        self._departments: Optional[List[str]] = None
+        self._department_of: Optional[Dict[str, str]] = None
+        # Stores with unsaved changes, and nesting depth of batch() blocks
+        self._dirty = {"employees": False, "leave_requests": False, "users": False}
+        self._batch_depth = 0
+        # blake2b digest of each store file as last read/written, to skip no-op writes
+        self._last_digests: Dict[str, bytes] = {}
+        # Shared across sessions via st.cache_resource, so mutations take the lock
+        self._lock = threading.RLock()
+        # Bumped on every mutation; used as a cache key for derived views
+        self._version = 0
+        # Pending timer for coalesced writes (see queue_user_update)
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush_pending)
         self.load_data()
     
     def load_data(self):
         """Load data from JSON files"""
-        if os.path.exists(EMPLOYEES_FILE):
-            try:
-                with open(EMPLOYEES_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.employees = {k: Employee.from_dict(v) for k, v in data.items()}
-            except (json.JSONDecodeError, IOError):
-                self.employees = {}
+        self.employees = {k: Employee.from_dict(v) for k, v in self._read_store(EMPLOYEES_FILE).items()}
         
         # Create sample employees if none exist
         if not self.employees:
             self._create_sample_employees()
         
-        if os.path.exists(DATA_FILE):
-            try:
-                with open(DATA_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.leave_requests = {k: LeaveRequest.from_dict(v) for k, v in data.items()}
-            except (json.JSONDecodeError, IOError):
-                self.leave_requests = {}
+        self.leave_requests = {k: LeaveRequest.from_dict(v) for k, v in self._read_store(DATA_FILE).items()}
+        self._reindex_leave_requests()
         
-        if os.path.exists(USERS_FILE):
-            try:
-                with open(USERS_FILE, 'r') as f:
-                    data = json.load(f)
-                    self.users = {k: User.from_dict(v) for k, v in data.items()}
-            except (json.JSONDecodeError, IOError):
-                self.users = {}
+        self.users = {k: User.from_dict(v) for k, v in self._read_store(USERS_FILE).items()}
         
         # Create default users if none exist (fresh deployment or reset)
         if not self.users:
             self._create_default_users()
     
+    def _read_store(self, path: str) -> Dict:
+        """Read one JSON store, treating a missing or unreadable file as empty"""
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            self._last_digests[path] = hashlib.blake2b(raw, digest_size=16).digest()
+            return _json_loads(raw)
+        except (ValueError, IOError):
+            return {}
+    
+    def _index_leave_request(self, request_id: str, request: LeaveRequest):
+        """Add a request to the status/employee buckets"""
+        self._by_status[request.status][request_id] = request
+        self._by_employee[request.employee_id][request_id] = request
+        if request.status in ACTIVE_STATUSES:
+            self._active_by_employee[request.employee_id][request_id] = request
+    
+    def _unindex_leave_request(self, request_id: str, request: LeaveRequest, keep_employee_slot: bool = False):
+        """Remove a request from the status/employee buckets"""
+        self._by_status[request.status].pop(request_id, None)
+        self._active_by_employee[request.employee_id].pop(request_id, None)
+        # In-place updates keep the request's position in its employee's history
+        if not keep_employee_slot:
+            self._by_employee[request.employee_id].pop(request_id, None)
+    
+    def _reindex_leave_requests(self):
+        """Rebuild all leave request indexes from scratch (after load or reset)"""
+        self._by_status.clear()
+        self._active_by_employee.clear()
+        self._by_employee.clear()
+        for req_id, req in self.leave_requests.items():
+            self._index_leave_request(req_id, req)
+        self._invalidate_leave_index()
+    
+    def _invalidate_leave_index(self):
+        """Drop derived leave request indexes after a mutation"""
+        self._interval_index = None
+        self._requests_frame = None
+    
+    @property
+    def version(self) -> int:
+        """Monotonic counter of mutations, for keying cached views"""
+        return self._version
+    
+    def get_requests_by_status(self, *statuses: str) -> List[LeaveRequest]:
+        """List requests with any of the given statuses straight from the status buckets"""
+        with self._lock:
+            return [req for status in statuses for req in self._by_status.get(status, {}).values()]
+    
+    def count_requests_by_status(self, *statuses: str) -> int:
+        """Number of requests with any of the given statuses, from the bucket sizes"""
+        with self._lock:
+            return sum(len(self._by_status.get(status, ())) for status in statuses)
+    
+    def get_active_requests(self, employee_id: str) -> List[LeaveRequest]:
+        """List an employee's requests that still occupy the calendar"""
+        with self._lock:
+            return list(self._active_by_employee.get(employee_id, {}).values())
+    
+    def get_departments(self) -> List[str]:
+        """Sorted list of departments that currently have employees"""
+        with self._lock:
+            if self._departments is None:
+                self._departments = sorted({emp.department for emp in self.employees.values()})
+            return list(self._departments)
+    
+    def get_department_map(self) -> Dict[str, str]:
+        """
+        Map employee id -> department, for joining against request tables.
+        The dict is shared, so callers must not modify it.
+        """
+        with self._lock:
+            if self._department_of is None:
+                self._department_of = {emp.id: emp.department for emp in self.employees.values()}
+            return self._department_of
+    
+    def get_employee_requests(self, employee_id: str) -> List[LeaveRequest]:
+        """List all of an employee's requests, in submission order"""
+        with self._lock:
+            return list(self._by_employee.get(employee_id, {}).values())
+    
+    def get_interval_index(self) -> LeaveIntervalIndex:
+        """Return the interval index over active leave requests, rebuilding it if stale"""
+        with self._lock:
+            if self._interval_index is None:
+                self._interval_index = self._build_interval_index()
+            return self._interval_index
+    
+    def get_active_requests_between(self, start_date: DateLike, end_date: DateLike) -> List[LeaveRequest]:
+        """List active requests overlapping [start_date, end_date], in submission order"""
+        start = _to_ordinal(start_date)
+        end = _to_ordinal(end_date)
+        index = self.get_interval_index()
+        # Binary search past intervals ending before the range, then keep those starting inside it
+        first = np.searchsorted(index.ends, start, side="left")
+        positions = np.sort(index.positions[first:][index.starts[first:] <= end])
+        return [index.requests[pos][1] for pos in positions]
+    
+    def _build_interval_index(self) -> LeaveIntervalIndex:
+        """Build the sorted interval index from the current leave requests"""
+        requests = [
+            (req_id, req) for req_id, req in self.leave_requests.items()
+            if req.status in ACTIVE_STATUSES
+        ]
+        count = len(requests)
+        employee_code_of: Dict[str, int] = {}
+        starts = np.fromiter((req.start_ord for _, req in requests), dtype=np.int64, count=count)
+        ends = np.fromiter((req.end_ord for _, req in requests), dtype=np.int64, count=count)
+        employee_codes = np.fromiter(
+            (employee_code_of.setdefault(req.employee_id, len(employee_code_of)) for _, req in requests),
+            dtype=np.int64, count=count
+        )
+        positions = np.argsort(ends, kind="stable")
+        
+        # Per-employee day bitmaps: one AND answers "is this employee away in a range"
+        base_ord = int(starts.min()) if count else 0
+        occupancy: Dict[str, int] = defaultdict(int)
+        for _, req in requests:
+            occupancy[req.employee_id] |= _day_mask(req.start_ord, req.end_ord, base_ord)
+        
+        return LeaveIntervalIndex(
+            starts[positions], ends[positions], employee_codes[positions],
+            positions, requests, employee_code_of, base_ord, dict(occupancy)
+        )
+    
+    def get_requests_frame(self) -> pd.DataFrame:
+        """
+        Return a DataFrame mirror of all leave requests for aggregations, rebuilding it if stale.
+        Columns follow LeaveRequest.to_dict(), with start_date/end_date parsed to datetime64.
+        The frame is shared, so callers must not modify it in place.
+        """
+        with self._lock:
+            if self._requests_frame is None:
+                self._requests_frame = self._build_requests_frame()
+            return self._requests_frame
+    
+    def _build_requests_frame(self) -> pd.DataFrame:
+        """Build the leave request DataFrame from the current leave requests"""
+        columns = [f.name for f in fields(LeaveRequest) if f.init]
+        df = pd.DataFrame.from_records(
+            [req.to_dict() for req in self.leave_requests.values()], columns=columns
+        )
+        df["start_date"] = pd.to_datetime(df["start_date"], format="%Y-%m-%d", errors="coerce")
+        df["end_date"] = pd.to_datetime(df["end_date"], format="%Y-%m-%d", errors="coerce")
+        return df
+    
     def save_data(self):
-        """Save data to JSON files"""
-        with open(EMPLOYEES_FILE, 'w') as f:
-            json.dump({k: v.to_dict() for k, v in self.employees.items()}, f, indent=2)
-        with open(DATA_FILE, 'w') as f:
-            json.dump({k: v.to_dict() for k, v in self.leave_requests.items()}, f, indent=2)
-        with open(USERS_FILE, 'w') as f:
-            json.dump({k: v.to_dict() for k, v in self.users.items()}, f, indent=2)
+        """Save all data to JSON files"""
+        self._mark_dirty("employees", "leave_requests", "users")
+    
+    def _mark_dirty(self, *stores: str):
+        """Flag stores as changed and write them unless inside a batch"""
+        with self._lock:
+            self._version += 1
+            for store in stores:
+                self._dirty[store] = True
+            if "employees" in stores:
+                self._departments = None
+                self._department_of = None
+            if not self._batch_depth:
+                self._flush()
+    
+    def _flush(self):
+        """Write only the stores that changed since the last flush"""
+        files = {
+            "employees": (EMPLOYEES_FILE, self.employees),
+            "leave_requests": (DATA_FILE, self.leave_requests),
+            "users": (USERS_FILE, self.users),
+        }
+        for store, dirty in self._dirty.items():
+            if dirty:
+                path, records = files[store]
+                self._write_store(path, records)
+                self._dirty[store] = False
+    
+    def _write_store(self, path: str, data: Dict):
+        """
+        Write one JSON store of records atomically: the payload goes to a temp file in
+        the same directory, is fsynced, then renamed over the target. Skipped when the
+        content is unchanged since the last read/write.
+        """
+        payload = _json_dumps(data)
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if self._last_digests.get(path) == digest and os.path.exists(path):
+            return
+        
+        tmp = tempfile.NamedTemporaryFile(
+            'wb', dir=os.path.dirname(os.path.abspath(path)),
+            prefix=os.path.basename(path) + ".", suffix=".tmp", delete=False
+        )
+        try:
+            with tmp:
+                tmp.write(payload)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp.name, path)
+        except OSError:
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+            raise
+        self._last_digests[path] = digest
+    
+    def _schedule_flush(self):
+        """Flush dirty stores after DEFERRED_WRITE_SECONDS, coalescing writes until then"""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(DEFERRED_WRITE_SECONDS, self.flush_pending)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def flush_pending(self):
+        """Write any stores with deferred changes (timer callback and at exit)"""
+        with self._lock:
+            self._flush_timer = None
+            if not self._batch_depth:
+                self._flush()
+    
+    @contextmanager
+    def batch(self):
+        """Defer writes until the outermost batch block exits (e.g. bulk imports)"""
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush()
     
     def _create_sample_employees(self):
         """Create sample employees for demonstration"""
-        sample_employees = [
-            Employee("EMP001", "Ahmed Hassan", "ahmed@company.com", "Engineering", "Senior Developer", "2020-03-15"),
-            Employee("EMP002", "Fatima Al Zahra", "fatima@company.com", "Engineering", "Software Engineer", "2021-06-01"),
-            Employee("EMP003", "Mohammed Ali", "mohammed@company.com", "Engineering", "DevOps Engineer", "2019-11-20"),
-            Employee("EMP004", "Sarah Johnson", "sarah@company.com", "HR", "HR Manager", "2018-01-10"),
-            Employee("EMP005", "Omar Farooq", "omar@company.com", "HR", "HR Specialist", "2022-03-01"),
-            Employee("EMP006", "Layla Mahmoud", "layla@company.com", "Finance", "Finance Manager", "2017-08-15"),
-            Employee("EMP007", "Khalid Ibrahim", "khalid@company.com", "Finance", "Accountant", "2021-02-14"),
-            Employee("EMP008", "Aisha Noor", "aisha@company.com", "Marketing", "Marketing Director", "2019-05-20"),
-            Employee("EMP009", "Yusuf Khan", "yusuf@company.com", "Marketing", "Marketing Specialist", "2023-01-15"),
-            Employee("EMP010", "Zainab Omar", "zainab@company.com", "Operations", "Operations Manager", "2020-09-01"),
-        ]
-        for emp in sample_employees:
+        for row in SAMPLE_EMPLOYEES:
+            emp = Employee(*row)
             self.employees[emp.id] = emp
-        self.save_data()
+        self._mark_dirty("employees")
     
     def _create_default_users(self):
-        """Create default admin and manager accounts"""
-        auth = AuthManager()
-        
-        # Create admin user (linked to Sarah Johnson - HR Manager)
-        admin_pass, admin_salt = auth.hash_password("admin123")
-        admin_user = User(
-            username="admin",
-            password_hash=admin_pass,
-            salt=admin_salt,
-            employee_id="EMP004",
-            role="admin",
-            is_active=True
-        )
-        self.users["admin"] = admin_user
-        
-        # Create manager user (linked to Layla Mahmoud - Finance Manager)
-        manager_pass, manager_salt = auth.hash_password("manager123")
-        manager_user = User(
-            username="manager",
-            password_hash=manager_pass,
-            salt=manager_salt,
-            employee_id="EMP006",
-            role="manager",
-            is_active=True
-        )
-        self.users["manager"] = manager_user
-        
-        # Create sample employee users
-        for emp_id, username, password in [
-            ("EMP001", "ahmed.hassan", "employee123"),
-            ("EMP002", "fatima.zahra", "employee123"),
-            ("EMP003", "mohammed.ali", "employee123"),
-        ]:
-            emp_pass, emp_salt = auth.hash_password(password)
-            emp_user = User(
+        """Create default admin, manager and sample employee accounts"""
+        # The slow KDF runs once per process; later resets reuse its output
+        for (username, _, employee_id, role), (password_hash, salt) in zip(DEFAULT_ACCOUNTS, get_default_account_hashes()):
+            self.users[username] = User(
                 username=username,
-                password_hash=emp_pass,
-                salt=emp_salt,
-                employee_id=emp_id,
-                role="employee",
+                password_hash=password_hash,
+                salt=salt,
+                employee_id=employee_id,
+                role=role,
                 is_active=True
             )
-            self.users[username] = emp_user
-        
-        self.save_data()
+        self._mark_dirty("users")
     
     def add_user(self, user: User):
-        self.users[user.username] = user
-        self.save_data()
+        with self._lock:
+            self.users[user.username] = user
+            self._mark_dirty("users")
+    
+    def add_users_bulk(self, users: List[User]):
+        """Add many users with a single save"""
+        if not users:
+            return
+        with self._lock:
+            self.users.update((user.username, user) for user in users)
+            self._mark_dirty("users")
     
     def update_user(self, username: str, **kwargs):
-        if username in self.users:
-            for key, value in kwargs.items():
-                setattr(self.users[username], key, value)
-            self.save_data()
+        with self._lock:
+            if username in self.users:
+                for key, value in kwargs.items():
+                    setattr(self.users[username], key, value)
+                self._mark_dirty("users")
+    
+    def queue_user_update(self, username: str, **kwargs):
+        """Update a user in memory now but defer the save, for frequent low-value fields"""
+        with self._lock:
+            if username in self.users:
+                for key, value in kwargs.items():
+                    setattr(self.users[username], key, value)
+                self._version += 1
+                self._dirty["users"] = True
+                self._schedule_flush()
     
     def delete_user(self, username: str):
-        if username in self.users:
-            del self.users[username]
-            self.save_data()
+        with self._lock:
+            if username in self.users:
+                del self.users[username]
+                self._mark_dirty("users")
     
     def add_employee(self, employee: Employee):
-        self.employees[employee.id] = employee
-        self.save_data()
+        with self._lock:
+            self.employees[employee.id] = employee
+            self._mark_dirty("employees")
+    
+    def add_employees_bulk(self, employees: List[Employee]):
+        """Add many employees with a single save"""
+        if not employees:
+            return
+        with self._lock:
+            self.employees.update((employee.id, employee) for employee in employees)
+            self._mark_dirty("employees")
     
     def update_employee(self, employee_id: str, **kwargs):
-        if employee_id in self.employees:
-            for key, value in kwargs.items():
-                setattr(self.employees[employee_id], key, value)
-            self.save_data()
+        with self._lock:
+            if employee_id in self.employees:
+                for key, value in kwargs.items():
+                    setattr(self.employees[employee_id], key, value)
+                self._mark_dirty("employees")
     
     def delete_employee(self, employee_id: str):
-        if employee_id in self.employees:
-            del self.employees[employee_id]
-            self.save_data()
+        with self._lock:
+            if employee_id in self.employees:
+                del self.employees[employee_id]
+                self._mark_dirty("employees")
     
     def add_leave_request(self, request: LeaveRequest):
-        self.leave_requests[request.id] = request
-        self.save_data()
+        with self._lock:
+            if request.id in self.leave_requests:
+                self._unindex_leave_request(request.id, self.leave_requests[request.id])
+            self.leave_requests[request.id] = request
+            self._index_leave_request(request.id, request)
+            self._invalidate_leave_index()
+            self._mark_dirty("leave_requests")
+    
+    def add_leave_requests_bulk(self, requests: List[LeaveRequest]):
+        """Add many leave requests with a single index rebuild and save"""
+        if not requests:
+            return
+        with self._lock:
+            for request in requests:
+                if request.id in self.leave_requests:
+                    self._unindex_leave_request(request.id, self.leave_requests[request.id])
+                self.leave_requests[request.id] = request
+                self._index_leave_request(request.id, request)
+            self._invalidate_leave_index()
+            self._mark_dirty("leave_requests")
     
     def update_leave_request(self, request_id: str, **kwargs):
-        if request_id in self.leave_requests:
-            for key, value in kwargs.items():
-                setattr(self.leave_requests[request_id], key, value)
-            self.save_data()
+        with self._lock:
+            if request_id in self.leave_requests:
+                request = self.leave_requests[request_id]
+                previous_employee_id = request.employee_id
+                self._unindex_leave_request(request_id, request, keep_employee_slot=True)
+                for key, value in kwargs.items():
+                    setattr(request, key, value)
+                if request.employee_id != previous_employee_id:
+                    self._by_employee[previous_employee_id].pop(request_id, None)
+                self._index_leave_request(request_id, request)
+                self._invalidate_leave_index()
+                self._mark_dirty("leave_requests")
     
     def delete_leave_request(self, request_id: str):
-        if request_id in self.leave_requests:
-            del self.leave_requests[request_id]
-            self.save_data()
+        with self._lock:
+            if request_id in self.leave_requests:
+                self._unindex_leave_request(request_id, self.leave_requests[request_id])
+                del self.leave_requests[request_id]
+                self._invalidate_leave_index()
+                self._mark_dirty("leave_requests")
 
 
 # ============== LEAVE CALCULATOR ==============
 class LeaveCalculator:
     @staticmethod
-    def calculate_working_days(start_date: str, end_date: str) -> int:
+    def calculate_working_days(start_date: DateLike, end_date: DateLike) -> int:
         """Calculate working days between two dates (excluding weekends)"""
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
+        start = np.datetime64(start_date, "D")
+        end = np.datetime64(end_date, "D")
         
         if end < start:
             return 0
         
-        # UAE weekends are Saturday and Sunday
-        days = 0
-        current = start
-        while current <= end:
-            if current.weekday() < 5:  # Monday = 0, Friday = 4
-                days += 1
-            current += timedelta(days=1)
-        
-        return days
+        # UAE weekends are Saturday and Sunday (busday_count excludes the end date)
+        return int(np.busday_count(start, end + np.timedelta64(1, "D"), weekmask="1111100"))
     
     @staticmethod
-    def calculate_calendar_days(start_date: str, end_date: str) -> int:
+    def calculate_calendar_days(start_date: DateLike, end_date: DateLike) -> int:
         """Calculate total calendar days"""
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
-        return (end - start).days + 1
+        return _to_ordinal(end_date) - _to_ordinal(start_date) + 1
     
     @staticmethod
     def check_conflicts(
         data_manager: DataManager,
         employee_id: str,
-        start_date: str,
-        end_date: str,
+        start_date: DateLike,
+        end_date: DateLike,
         exclude_request_id: str = None
     ) -> Tuple[bool, str, List[Dict]]:
         """
         Check if the requested leave conflicts with other approved leaves.
         Returns: (has_conflict, warning_message, conflicting_leaves)
         """
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
+        start = _to_ordinal(start_date)
+        end = _to_ordinal(end_date)
+        index = data_manager.get_interval_index()
+        employee_code = index.employee_code_of.get(employee_id, -1)
+        
+        # Intervals are sorted by end date, so only the tail ending on/after the
+        # requested start can overlap; of those keep other employees' leaves
+        # starting on/before the requested end
+        first = np.searchsorted(index.ends, start, side="left")
+        mask = (index.starts[first:] <= end) & (index.employee_codes[first:] != employee_code)
+        overlapping = np.sort(index.positions[first:][mask])
         
         conflicting_leaves = []
         
-        for req_id, req in data_manager.leave_requests.items():
+        for pos in overlapping:
+            req_id, req = index.requests[pos]
             if req_id == exclude_request_id:
                 continue
-            if req.status not in ["Manager_Approved", "Admin_Approved", "Pending"]:
-                continue
-            if req.employee_id == employee_id:
-                continue
-            
-            req_start = datetime.strptime(req.start_date, "%Y-%m-%d")
-            req_end = datetime.strptime(req.end_date, "%Y-%m-%d")
             
-            # Check if dates overlap
-            if not (end < req_start or start > req_end):
-                conflicting_leaves.append({
-                    "employee_id": req.employee_id,
-                    "employee_name": req.employee_name,
-                    "start_date": req.start_date,
-                    "end_date": req.end_date,
-                    "leave_type": req.leave_type,
-                    "status": req.status,
-                })
+            conflicting_leaves.append({
+                "employee_id": req.employee_id,
+                "employee_name": req.employee_name,
+                "start_date": req.start_date,
+                "end_date": req.end_date,
+                "leave_type": req.leave_type,
+                "status": req.status,
+            })
         
         if len(conflicting_leaves) >= 2:
             names = ", ".join([c["employee_name"] for c in conflicting_leaves])
@@ -590,48 +1113,261 @@ class LeaveCalculator:
         
         return False, "", []
     
+    @staticmethod
+    def has_conflict(
+        data_manager: DataManager,
+        employee_id: str,
+        start_date: DateLike,
+        end_date: DateLike,
+        exclude_request_id: str = None
+    ) -> bool:
+        """
+        Fast check for the check_conflicts warning condition (2+ other employees on
+        overlapping leave), stopping at the second hit without building messages.
+        """
+        start = _to_ordinal(start_date)
+        end = _to_ordinal(end_date)
+        index = data_manager.get_interval_index()
+        employee_code = index.employee_code_of.get(employee_id, -1)
+        
+        first = np.searchsorted(index.ends, start, side="left")
+        mask = (index.starts[first:] <= end) & (index.employee_codes[first:] != employee_code)
+        found = 0
+        for pos in index.positions[first:][mask]:
+            if index.requests[pos][0] != exclude_request_id:
+                found += 1
+                if found >= 2:
+                    return True
+        return False
+    
+    @staticmethod
+    def find_own_overlaps(
+        data_manager: DataManager,
+        employee_id: str,
+        start_date: DateLike,
+        end_date: DateLike,
+        exclude_request_id: str = None
+    ) -> List[LeaveRequest]:
+        """Get the employee's own active requests overlapping the dates (these block submission)"""
+        start = _to_ordinal(start_date)
+        end = _to_ordinal(end_date)
+        
+        index = data_manager.get_interval_index()
+        if not index.occupancy.get(employee_id, 0) & _day_mask(start, end, index.base_ord):
+            return []
+        
+        overlaps = [
+            req for req in data_manager.get_active_requests(employee_id)
+            if req.id != exclude_request_id and not (end < req.start_ord or start > req.end_ord)
+        ]
+        overlaps.sort(key=lambda r: r.start_ord)
+        return overlaps
+    
     @staticmethod
     def get_department_conflicts(
         data_manager: DataManager,
         department: str,
-        start_date: str,
-        end_date: str,
+        start_date: DateLike,
+        end_date: DateLike,
         exclude_employee_id: str = None
     ) -> List[Dict]:
         """Get conflicts within the same department"""
-        start = datetime.strptime(start_date, "%Y-%m-%d")
-        end = datetime.strptime(end_date, "%Y-%m-%d")
+        start = _to_ordinal(start_date)
+        end = _to_ordinal(end_date)
         
         conflicts = []
-        department_employees = [
-            e for e in data_manager.employees.values()
+        department_emp_ids = frozenset(
+            e.id for e in data_manager.employees.values()
             if e.department == department and e.id != exclude_employee_id
+        )
+        
+        # Only walk the requests of colleagues whose day bitmap intersects the range
+        index = data_manager.get_interval_index()
+        range_mask = _day_mask(start, end, index.base_ord)
+        away_emp_ids = [
+            emp_id for emp_id in department_emp_ids
+            if index.occupancy.get(emp_id, 0) & range_mask
         ]
         
-        for req in data_manager.leave_requests.values():
-            if req.status not in ["Manager_Approved", "Admin_Approved", "Pending"]:
-                continue
-            if req.employee_id not in [e.id for e in department_employees]:
-                continue
-            
-            req_start = datetime.strptime(req.start_date, "%Y-%m-%d")
-            req_end = datetime.strptime(req.end_date, "%Y-%m-%d")
-            
-            if not (end < req_start or start > req_end):
+        for req in (r for emp_id in away_emp_ids for r in data_manager.get_active_requests(emp_id)):
+            if not (end < req.start_ord or start > req.end_ord):
                 conflicts.append({
                     "employee_name": req.employee_name,
                     "leave_type": req.leave_type,
                     "dates": f"{req.start_date} to {req.end_date}",
                 })
         
+        # Buckets are not kept in submission order, so list chronologically
+        conflicts.sort(key=lambda c: (c["dates"], c["employee_name"]))
         return conflicts
 
 
 # ============== STREAMLIT UI ==============
+@st.cache_resource
+def get_data_manager() -> DataManager:
+    """Load the data once per server process and share it across sessions"""
+    return DataManager()
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_department_conflicts_cached(
+    _data_manager: DataManager,
+    version: int,
+    department: str,
+    start_date: DateLike,
+    end_date: DateLike,
+    exclude_employee_id: str = None
+) -> List[Dict]:
+    """Department conflicts memoized per data version (the leave form reruns on every widget change)"""
+    return LeaveCalculator.get_department_conflicts(_data_manager, department, start_date, end_date, exclude_employee_id)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_active_employee_labels_cached(_data_manager: DataManager, version: int) -> Dict[str, str]:
+    """Active employee ids mapped to their leave form labels, memoized per data version"""
+    return {
+        emp.id: f"{emp.name} ({emp.department}) - Balance: {emp.annual_leave_balance} days"
+        for emp in _data_manager.employees.values() if emp.status == "Active"
+    }
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_dashboard_data_cached(_data_manager: DataManager, version: int, today: date) -> Dict:
+    """Dashboard metrics, tables and conflicts, memoized per data version and day"""
+    now = datetime.now()
+    
+    requests_df = _data_manager.get_requests_frame()
+    active_requests = _data_manager.count_requests_by_status("Pending", "Admin_Approved")
+    approved_df = requests_df[requests_df["status"] == "Manager_Approved"]
+    today_ts = pd.Timestamp(today)
+    approved_this_month = int((
+        (approved_df["start_date"].dt.month == today_ts.month)
+        & (approved_df["start_date"].dt.year == today_ts.year)
+    ).sum())
+    on_leave_today_mask = (approved_df["start_date"] <= today_ts) & (approved_df["end_date"] >= today_ts)
+    
+    department_of = _data_manager.get_department_map()
+    
+    on_leave_today_df = approved_df[on_leave_today_mask]
+    on_leave_today_table = pd.DataFrame({
+        "Name": on_leave_today_df["employee_name"],
+        "Department": on_leave_today_df["employee_id"].map(department_of).fillna("N/A"),
+        "Leave Type": on_leave_today_df["leave_type"],
+        "Until": on_leave_today_df["end_date"].dt.strftime("%Y-%m-%d"),
+    }).reset_index(drop=True)
+    
+    now_ts = pd.Timestamp(now)
+    upcoming_df = approved_df[
+        (approved_df["start_date"] >= now_ts) & (approved_df["start_date"] <= now_ts + pd.Timedelta(days=30))
+    ].sort_values("start_date", kind="stable")
+    upcoming_table = pd.DataFrame({
+        "Name": upcoming_df["employee_name"],
+        "Department": upcoming_df["employee_id"].map(department_of).fillna("N/A"),
+        "Leave Type": upcoming_df["leave_type"],
+        "From": upcoming_df["start_date"].dt.strftime("%Y-%m-%d"),
+        "To": upcoming_df["end_date"].dt.strftime("%Y-%m-%d"),
+        "Days": upcoming_df["days_requested"],
+    }).reset_index(drop=True)
+    
+    conflicts = []
+    intervals = []
+    for req in _data_manager.get_requests_by_status("Manager_Approved"):
+        department = department_of.get(req.employee_id)
+        if department is not None:
+            intervals.append((req.start_ord, req.end_ord, req, department))
+    intervals.sort(key=lambda iv: iv[0])
+    
+    # Sweep by start date, keeping a min-heap (by end date) of still-running leaves
+    # per department; everything left in the heap overlaps the current leave
+    active_by_dept = defaultdict(list)
+    for seq, (start, end, req, department) in enumerate(intervals):
+        active = active_by_dept[department]
+        while active and active[0][0] < start:
+            heapq.heappop(active)
+        for other_end, _, other in active:
+            # The overlap runs from this leave's start to the earlier end; reuse the stored ISO strings
+            overlap_end = req.end_date if end <= other_end else other.end_date
+            conflicts.append({
+                "Department": department,
+                "Employee 1": other.employee_name,
+                "Employee 2": req.employee_name,
+                "Dates": f"{req.start_date} to {overlap_end}",
+            })
+        heapq.heappush(active, (end, seq, req))
+    
+    return {
+        "total_employees": len(_data_manager.employees),
+        "active_requests": active_requests,
+        "approved_this_month": approved_this_month,
+        "on_leave_today": int(on_leave_today_mask.sum()),
+        "on_leave_today_df": on_leave_today_table,
+        "upcoming_df": upcoming_table,
+        "conflicts": conflicts,
+    }
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_leave_report_csv_cached(_report_df: pd.DataFrame, version: int, start_date: date, end_date: date) -> str:
+    """CSV export of the leave calendar report; the table is fully determined by data version and range"""
+    return _report_df.to_csv(index=False)
+
+
+def _leave_info_card(leave_type: str) -> str:
+    """Detailed UAE law card for a leave type (admin leave form)"""
+    leave_info = LEAVE_TYPES[leave_type]
+    return f"""
+            <div style="background-color: #1e3a5f; padding: 15px; border-radius: 8px; border: 1px solid #4a90d9; margin: 10px 0;">
+                <h4 style="color: #ffffff; margin: 0 0 10px 0;">📋 {leave_type}</h4>
+                <table style="width: 100%; color: #e0e0e0; font-size: 13px;">
+                    <tr>
+                        <td style="padding: 4px; width: 30%;"><strong>🇦🇪 UAE Law:</strong></td>
+                        <td style="padding: 4px;">{leave_info['uae_law']}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 4px;"><strong>📊 Entitlement:</strong></td>
+                        <td style="padding: 4px;">{leave_info['entitlement']}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 4px;"><strong>💰 Payment:</strong></td>
+                        <td style="padding: 4px;">{leave_info['payment']}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 4px;"><strong>📋 Requirements:</strong></td>
+                        <td style="padding: 4px;">{leave_info['requirements']}</td>
+                    </tr>
+                    <tr>
+                        <td style="padding: 4px;"><strong>🔄 Carry Forward:</strong></td>
+                        <td style="padding: 4px;">{leave_info['carry_forward']}</td>
+                    </tr>
+                </table>
+            </div>
+            """
+
+
+def _leave_summary_card(leave_type: str) -> str:
+    """Entitlement summary card for a leave type (employee leave form)"""
+    leave_info = LEAVE_TYPES[leave_type]
+    return f"""
+            <div style="background-color: #1e3a5f; padding: 15px; border-radius: 8px; border: 1px solid #4a90d9; margin: 10px 0;">
+                <h4 style="color: #ffffff; margin: 0 0 10px 0;">📋 {leave_type}</h4>
+                <table style="width: 100%; color: #e0e0e0; font-size: 13px;">
+                    <tr><td style="padding: 4px;"><strong>📊 Entitlement:</strong></td><td>{leave_info['entitlement']}</td></tr>
+                    <tr><td style="padding: 4px;"><strong>💰 Payment:</strong></td><td>{leave_info['payment']}</td></tr>
+                    <tr><td style="padding: 4px;"><strong>📋 Requirements:</strong></td><td>{leave_info['requirements']}</td></tr>
+                </table>
+            </div>
+            """
+
+
+# Leave type cards only depend on the static LEAVE_TYPES table, so render them once
+LEAVE_INFO_CARDS = MappingProxyType({name: _leave_info_card(name) for name in LEAVE_TYPE_NAMES})
+LEAVE_SUMMARY_CARDS = MappingProxyType({name: _leave_summary_card(name) for name in LEAVE_TYPE_NAMES})
+
+
 def init_session_state():
     """Initialize session state variables"""
     if 'data_manager' not in st.session_state:
-        st.session_state.data_manager = DataManager()
+        st.session_state.data_manager = get_data_manager()
     if 'calculator' not in st.session_state:
         st.session_state.calculator = LeaveCalculator()
     if 'authenticated' not in st.session_state:
@@ -668,11 +1404,10 @@ def render_login():
             
             if submitted:
                 data_manager = st.session_state.data_manager
-                auth = AuthManager()
                 
                 if username in data_manager.users:
                     user = data_manager.users[username]
-                    if user.is_active and auth.verify_password(password, user.password_hash, user.salt):
+                    if user.is_active and AuthManager.verify_password(password, user.password_hash, user.salt):
                         # Login successful
                         st.session_state.authenticated = True
                         st.session_state.current_user = username
@@ -680,8 +1415,16 @@ def render_login():
                         st.session_state.employee_id = user.employee_id
                         
                         # Update last login
-                        user.last_login = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        data_manager.save_data()
+                        last_login = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        if AuthManager.needs_rehash(user.password_hash):
+                            # Upgrade legacy hashes now that the plain password is known
+                            password_hash, salt = AuthManager.hash_password(password)
+                            data_manager.update_user(
+                                username, password_hash=password_hash, salt=salt, last_login=last_login
+                            )
+                        else:
+                            # Last login is informational, so its save is coalesced
+                            data_manager.queue_user_update(username, last_login=last_login)
                         
                         st.success(f"✅ Welcome, {username}!")
                         st.rerun()
@@ -749,105 +1492,110 @@ def render_dashboard(data_manager: DataManager):
     st.header("📊 Dashboard")
     
     col1, col2, col3, col4 = st.columns(4)
-    
-    total_employees = len(data_manager.employees)
-    active_requests = sum(1 for r in data_manager.leave_requests.values() if r.status in ["Pending", "Admin_Approved"])
-    approved_this_month = sum(
-        1 for r in data_manager.leave_requests.values()
-        if r.status == "Manager_Approved" and datetime.strptime(r.start_date, "%Y-%m-%d").month == datetime.now().month
-    )
-    on_leave_today = sum(
-        1 for r in data_manager.leave_requests.values()
-        if r.status == "Manager_Approved"
-        and datetime.strptime(r.start_date, "%Y-%m-%d") <= datetime.now()
-        and datetime.strptime(r.end_date, "%Y-%m-%d") >= datetime.now()
-    )
+    dashboard = get_dashboard_data_cached(data_manager, data_manager.version, date.today())
     
     with col1:
-        st.metric("Total Employees", total_employees)
+        st.metric("Total Employees", dashboard["total_employees"])
     with col2:
-        st.metric("Pending Requests", active_requests)
+        st.metric("Pending Requests", dashboard["active_requests"])
     with col3:
-        st.metric("Approved (This Month)", approved_this_month)
+        st.metric("Approved (This Month)", dashboard["approved_this_month"])
     with col4:
-        st.metric("On Leave Today", on_leave_today)
+        st.metric("On Leave Today", dashboard["on_leave_today"])
     
     # Today's leave overview
     st.subheader("🗓️ Who's On Leave Today")
-    today = datetime.now().strftime("%Y-%m-%d")
-    on_leave_today_list = []
-    
-    for req in data_manager.leave_requests.values():
-        if req.status == "Manager_Approved":
-            if req.start_date <= today <= req.end_date:
-                emp = data_manager.employees.get(req.employee_id)
-                on_leave_today_list.append({
-                    "Name": req.employee_name,
-                    "Department": emp.department if emp else "N/A",
-                    "Leave Type": req.leave_type,
-                    "Until": req.end_date,
-                })
-    
-    if on_leave_today_list:
-        st.dataframe(pd.DataFrame(on_leave_today_list), use_container_width=True)
+    if not dashboard["on_leave_today_df"].empty:
+        st.dataframe(dashboard["on_leave_today_df"], use_container_width=True)
     else:
         st.info("No one is on leave today.")
     
     # Upcoming leaves
     st.subheader("📅 Upcoming Leaves (Next 30 Days)")
-    upcoming = []
-    today_dt = datetime.now()
-    
-    for req in data_manager.leave_requests.values():
-        if req.status == "Manager_Approved":
-            start = datetime.strptime(req.start_date, "%Y-%m-%d")
-            if today_dt <= start <= today_dt + timedelta(days=30):
-                emp = data_manager.employees.get(req.employee_id)
-                upcoming.append({
-                    "Name": req.employee_name,
-                    "Department": emp.department if emp else "N/A",
-                    "Leave Type": req.leave_type,
-                    "From": req.start_date,
-                    "To": req.end_date,
-                    "Days": req.days_requested,
-                })
-    
-    if upcoming:
-        upcoming_df = pd.DataFrame(upcoming).sort_values("From")
-        st.dataframe(upcoming_df, use_container_width=True)
+    if not dashboard["upcoming_df"].empty:
+        st.dataframe(dashboard["upcoming_df"], use_container_width=True)
     else:
         st.info("No upcoming leaves in the next 30 days.")
     
     # Conflict warnings
     st.subheader("⚠️ Leave Conflict Alerts")
-    conflicts = []
-    approved_requests = [r for r in data_manager.leave_requests.values() if r.status == "Manager_Approved"]
-    
-    for i, req1 in enumerate(approved_requests):
-        for req2 in approved_requests[i+1:]:
-            start1 = datetime.strptime(req1.start_date, "%Y-%m-%d")
-            end1 = datetime.strptime(req1.end_date, "%Y-%m-%d")
-            start2 = datetime.strptime(req2.start_date, "%Y-%m-%d")
-            end2 = datetime.strptime(req2.end_date, "%Y-%m-%d")
-            
-            if not (end1 < start2 or start1 > end2):
-                emp1 = data_manager.employees.get(req1.employee_id)
-                emp2 = data_manager.employees.get(req2.employee_id)
-                if emp1 and emp2 and emp1.department == emp2.department:
-                    conflicts.append({
-                        "Department": emp1.department,
-                        "Employee 1": req1.employee_name,
-                        "Employee 2": req2.employee_name,
-                        "Dates": f"{max(start1, start2).strftime('%Y-%m-%d')} to {min(end1, end2).strftime('%Y-%m-%d')}",
-                    })
-    
-    if conflicts:
+    if dashboard["conflicts"]:
         st.error("⚠️ **Same Department Conflicts Detected!**")
-        st.dataframe(pd.DataFrame(conflicts), use_container_width=True)
+        st.dataframe(pd.DataFrame(dashboard["conflicts"]), use_container_width=True)
     else:
         st.success("✅ No department conflicts detected.")
 
 
+def _read_import_table(uploaded_file) -> pd.DataFrame:
+    """Read an uploaded CSV or Excel file with every cell as text ('' for blanks)"""
+    if uploaded_file.name.endswith('.csv'):
+        return pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+    # calamine parses the sheet natively; the openpyxl default already opens it read-only
+    return pd.read_excel(uploaded_file, engine=EXCEL_ENGINE, dtype=str, keep_default_na=False)
+
+
+# Rows per chunk when streaming CSV imports
+IMPORT_CHUNK_ROWS = 50_000
+
+
+def _iter_import_chunks(uploaded_file, chunksize: int = IMPORT_CHUNK_ROWS):
+    """Yield an uploaded CSV in row chunks of text cells (Excel files come back whole)"""
+    uploaded_file.seek(0)
+    if uploaded_file.name.endswith('.csv'):
+        yield from pd.read_csv(uploaded_file, dtype=str, keep_default_na=False, chunksize=chunksize)
+    else:
+        yield _read_import_table(uploaded_file)
+
+
+# Date layouts accepted by the leave CSV/Excel import, tried in order
+IMPORT_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y")
+
+
+# Status spellings accepted by the leave CSV/Excel import (anything else is Pending)
+IMPORT_STATUS_ALIASES = {
+    'approved': 'Manager_Approved',
+    'manager_approved': 'Manager_Approved',
+    'final approved': 'Manager_Approved',
+    'admin_approved': 'Admin_Approved',
+    'level 1 approved': 'Admin_Approved',
+    'rejected': 'Rejected',
+    'declined': 'Rejected',
+    'denied': 'Rejected',
+    'cancelled': 'Cancelled',
+    'canceled': 'Cancelled',
+}
+
+
+def _parse_import_dates(values: pd.Series) -> pd.Series:
+    """Parse a text column of dates to ISO strings (NaN where unparseable)"""
+    values = values.str.strip()
+    # Detect the layout that fits most of a small sample, then parse the whole column with it
+    sample = values[values != ""].head(20)
+    date_format, best_hits = None, 0
+    for fmt in IMPORT_DATE_FORMATS:
+        hits = pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum()
+        if hits > best_hits:
+            date_format, best_hits = fmt, hits
+            if hits == len(sample):
+                break
+    if date_format is None:
+        parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    else:
+        parsed = pd.to_datetime(values, format=date_format, errors="coerce")
+    # Files may mix layouts: retry the rows that missed with each other layout, a column at a time
+    for fmt in IMPORT_DATE_FORMATS:
+        missed = parsed.isna() & (values != "")
+        if not missed.any():
+            break
+        if fmt != date_format:
+            parsed = parsed.fillna(pd.to_datetime(values[missed], format=fmt, errors="coerce"))
+    # Anything else (ISO "T" times, month names, ...) is parsed cell by cell
+    missed = parsed.isna() & (values != "")
+    if missed.any():
+        parsed = parsed.fillna(pd.to_datetime(values[missed], format="mixed", errors="coerce"))
+    return parsed.dt.strftime("%Y-%m-%d")
+
+
 def render_employee_management(data_manager: DataManager):
     """Render employee management section"""
     st.header("👥 Employee Management")
@@ -856,32 +1604,31 @@ def render_employee_management(data_manager: DataManager):
     
     with tab1:
         if data_manager.employees:
-            emp_data = []
-            for emp in data_manager.employees.values():
-                # Calculate leave balance based on UAE law
-                join_date = datetime.strptime(emp.join_date, "%Y-%m-%d")
-                years_of_service = (datetime.now() - join_date).days / 365.25
-                
-                emp_data.append({
-                    "ID": emp.id,
-                    "Name": emp.name,
-                    "Email": emp.email,
-                    "Department": emp.department,
-                    "Position": emp.position,
-                    "Join Date": emp.join_date,
-                    "Years of Service": round(years_of_service, 1),
-                    "Leave Balance": emp.annual_leave_balance,
-                    "Status": emp.status,
-                })
-            
-            df = pd.DataFrame(emp_data)
+            df = pd.DataFrame([emp.to_dict() for emp in data_manager.employees.values()])
+            # Years of service for all employees in one vectorized subtraction
+            join_dates = pd.to_datetime(df["join_date"], format="ISO8601", errors="coerce")
+            df["years_of_service"] = ((pd.Timestamp.now() - join_dates).dt.days / 365.25).round(1)
+            df = df[[
+                "id", "name", "email", "department", "position", "join_date",
+                "years_of_service", "annual_leave_balance", "status",
+            ]].rename(columns={
+                "id": "ID",
+                "name": "Name",
+                "email": "Email",
+                "department": "Department",
+                "position": "Position",
+                "join_date": "Join Date",
+                "years_of_service": "Years of Service",
+                "annual_leave_balance": "Leave Balance",
+                "status": "Status",
+            })
             
             # Filter options
             col1, col2 = st.columns(2)
             with col1:
                 dept_filter = st.multiselect(
                     "Filter by Department",
-                    options=df["Department"].unique(),
+                    options=data_manager.get_departments(),
                     default=[]
                 )
             with col2:
@@ -1011,10 +1758,7 @@ def render_employee_management(data_manager: DataManager):
                     
                     if delete_btn:
                         # Check if employee has pending/approved leave
-                        has_leave = any(
-                            r.employee_id == selected_emp.id and r.status in ["Pending", "Approved"]
-                            for r in data_manager.leave_requests.values()
-                        )
+                        has_leave = bool(data_manager.get_active_requests(selected_emp.id))
                         if has_leave:
                             st.error("Cannot delete employee with pending or approved leave requests.")
                         else:
@@ -1065,14 +1809,13 @@ def render_employee_management(data_manager: DataManager):
             
             if uploaded_file is not None:
                 try:
-                    import json
-                    data = json.load(uploaded_file)
+                    data = _json_loads(uploaded_file.getvalue())
                     
                     st.markdown(f"**Preview:** Found {len(data)} employee(s)")
                     
                     # Show preview
                     preview_data = []
-                    for emp_id, emp_data in list(data.items())[:5]:
+                    for emp_id, emp_data in islice(data.items(), 5):
                         preview_data.append({
                             "ID": emp_id,
                             "Name": emp_data.get("name", "N/A"),
@@ -1101,13 +1844,21 @@ def render_employee_management(data_manager: DataManager):
                         error_count = 0
                         created_users = []
                         
+                        new_employees = []
+                        new_users = []
+                        pending_accounts = []
+                        import_errors = []
+                        taken_usernames = set(data_manager.users)
+                        
                         progress_bar = st.progress(0)
                         status_text = st.empty()
                         
+                        today_str = datetime.now().strftime("%Y-%m-%d")
+                        progress_step = max(1, len(data) // 100)
                         for i, (emp_id, emp_data) in enumerate(data.items()):
-                            progress = (i + 1) / len(data)
-                            progress_bar.progress(progress)
-                            status_text.text(f"Processing {i+1} of {len(data)}: {emp_data.get('name', emp_id)}")
+                            if i % progress_step == 0 or i == len(data) - 1:
+                                progress_bar.progress((i + 1) / len(data))
+                                status_text.text(f"Processing {i+1} of {len(data)}: {emp_data.get('name', emp_id)}")
                             
                             try:
                                 # Check if employee exists
@@ -1123,56 +1874,64 @@ def render_employee_management(data_manager: DataManager):
                                     email=emp_data.get("email", ""),
                                     department=emp_data.get("department", "Other"),
                                     position=emp_data.get("position", ""),
-                                    join_date=emp_data.get("join_date", datetime.now().strftime("%Y-%m-%d")),
+                                    join_date=emp_data.get("join_date", today_str),
                                     employment_type=emp_data.get("employment_type", "Full-time"),
                                     annual_leave_balance=emp_data.get("annual_leave_balance", 30.0),
                                     status=emp_data.get("status", "Active"),
                                     nationality=emp_data.get("nationality", ""),
                                     gender=emp_data.get("gender", "Unknown")
                                 )
-                                
-                                data_manager.add_employee(employee)
+                            
+                                new_employees.append(employee)
                                 success_count += 1
-                                
+                            
                                 # Create user account if requested
                                 if create_users:
-                                    auth = AuthManager()
                                     username = emp_data.get("email", "").split("@")[0].lower() if emp_data.get("email") else emp_id.lower()
                                     username = username.replace(".", "_")
-                                    
-                                    # Ensure unique username
+                                
+                                    # Ensure unique username, including accounts created earlier in this import
                                     base_username = username
                                     counter = 1
-                                    while username in data_manager.users:
+                                    while username in taken_usernames:
                                         username = f"{base_username}{counter}"
                                         counter += 1
-                                    
-                                    temp_password = auth.generate_temporary_password()
-                                    password_hash, salt = auth.hash_password(temp_password)
-                                    
-                                    new_user = User(
-                                        username=username,
-                                        password_hash=password_hash,
-                                        salt=salt,
-                                        employee_id=emp_id,
-                                        role="employee",
-                                        is_active=True
-                                    )
-                                    
-                                    data_manager.add_user(new_user)
+                                    taken_usernames.add(username)
+                                
+                                    temp_password = AuthManager.generate_temporary_password()
+                                    pending_accounts.append((username, emp_id, temp_password))
                                     created_users.append({
                                         "name": emp_data.get("name", ""),
                                         "username": username,
                                         "password": temp_password
                                     })
-                                
+                            
                             except Exception as e:
                                 error_count += 1
-                                st.error(f"Error importing {emp_id}: {str(e)}")
+                                import_errors.append(f"Error importing {emp_id}: {str(e)}")
+                        
+                        # Hash all temporary passwords together so the slow KDF runs in parallel
+                        password_hashes = AuthManager.hash_passwords([password for _, _, password in pending_accounts])
+                        for (username, emp_id, _), (password_hash, salt) in zip(pending_accounts, password_hashes):
+                            new_users.append(User(
+                                username=username,
+                                password_hash=password_hash,
+                                salt=salt,
+                                employee_id=emp_id,
+                                role="employee",
+                                is_active=True
+                            ))
+                        
+                        with data_manager.batch():
+                            data_manager.add_employees_bulk(new_employees)
+                            data_manager.add_users_bulk(new_users)
                         
                         progress_bar.empty()
                         status_text.empty()
                         
+                        for message in import_errors:
+                            st.error(message)
+                        
                         # Show results
                         st.success(f"✅ Import Complete!")
                         st.markdown(f"""
@@ -1219,10 +1978,8 @@ def render_employee_management(data_manager: DataManager):
             
             if uploaded_file is not None:
                 try:
-                    if uploaded_file.name.endswith('.csv'):
-                        df = pd.read_csv(uploaded_file)
-                    else:
-                        df = pd.read_excel(uploaded_file)
+                    # Read every cell as text so rows need no per-cell coercion
+                    df = _read_import_table(uploaded_file)
                     
                     st.markdown(f"**Preview:** {len(df)} employee(s) found")
                     st.dataframe(df.head(10))
@@ -1239,78 +1996,115 @@ def render_employee_management(data_manager: DataManager):
                         skipped_count = 0
                         error_count = 0
                         created_users = []
+                        new_employees = []
+                        new_users = []
+                        pending_accounts = []
+                        import_errors = []
+                        taken_usernames = set(data_manager.users)
+                        queued_ids = set()  # rows are saved after the loop, so track this file's ids too
                         
                         progress_bar = st.progress(0)
                         
-                        for i, row in df.iterrows():
-                            progress = (i + 1) / len(df)
-                            progress_bar.progress(progress)
-                            
-                            try:
-                                emp_id = str(row.get('id', f"EMP{i+1:03d}"))
-                                
-                                # Check if exists
-                                if emp_id in data_manager.employees:
+                        # Resolve every column up front (blank cells take the default), one vectorized op each
+                        def column(name, default=""):
+                            if name not in df.columns:
+                                return pd.Series(default, index=df.index, dtype=object)
+                            return df[name].mask(df[name] == "", default)
+                        
+                        default_ids = pd.Series([f"EMP{i+1:03d}" for i in range(len(df))], index=df.index)
+                        ids = df["id"].mask(df["id"] == "", default_ids) if "id" in df.columns else default_ids
+                        emails = column("email")
+                        usernames = emails.str.split("@").str[0].where(emails.str.contains("@", regex=False), ids)
+                        records = pd.DataFrame({
+                            "id": ids,
+                            "name": column("name"),
+                            "email": emails,
+                            "department": column("department", "Other"),
+                            "position": column("position"),
+                            "join_date": column("join_date", datetime.now().strftime("%Y-%m-%d")),
+                            "employment_type": column("employment_type", "Full-time"),
+                            "annual_leave_balance": column("annual_leave_balance", "30.0"),
+                            "status": column("status", "Active"),
+                            "nationality": column("nationality"),
+                            "gender": column("gender", "Unknown"),
+                            "username": usernames.str.lower().str.replace(r"[. ]", "_", regex=True),
+                        })
+                        
+                        progress_step = max(1, len(records) // 100)
+                        for i, row in enumerate(records.itertuples(index=False)):
+                            if i % progress_step == 0 or i == len(records) - 1:
+                                progress_bar.progress((i + 1) / len(records))
+                        
+                            try:
+                                emp_id = row.id
+                            
+                                # Check if exists, including rows queued earlier in this file
+                                if emp_id in data_manager.employees or emp_id in queued_ids:
                                     if skip_existing:
                                         skipped_count += 1
                                         continue
-                                
+                            
                                 employee = Employee(
                                     id=emp_id,
-                                    name=str(row.get('name', '')),
-                                    email=str(row.get('email', '')),
-                                    department=str(row.get('department', 'Other')),
-                                    position=str(row.get('position', '')),
-                                    join_date=str(row.get('join_date', datetime.now().strftime("%Y-%m-%d"))),
-                                    employment_type=str(row.get('employment_type', 'Full-time')),
-                                    annual_leave_balance=float(row.get('annual_leave_balance', 30.0)) if pd.notna(row.get('annual_leave_balance')) else 30.0,
-                                    status=str(row.get('status', 'Active')),
-                                    nationality=str(row.get('nationality', '')),
-                                    gender=str(row.get('gender', 'Unknown'))
+                                    name=row.name,
+                                    email=row.email,
+                                    department=row.department,
+                                    position=row.position,
+                                    join_date=row.join_date,
+                                    employment_type=row.employment_type,
+                                    annual_leave_balance=float(row.annual_leave_balance),
+                                    status=row.status,
+                                    nationality=row.nationality,
+                                    gender=row.gender
                                 )
-                                
-                                data_manager.add_employee(employee)
+                            
+                                new_employees.append(employee)
+                                queued_ids.add(emp_id)
                                 success_count += 1
-                                
+                            
                                 # Create user account
                                 if create_users:
-                                    auth = AuthManager()
-                                    email = str(row.get('email', ''))
-                                    username = email.split("@")[0].lower() if email and '@' in email else emp_id.lower()
-                                    username = username.replace(".", "_").replace(" ", "_")
-                                    
-                                    # Ensure unique
-                                    base_username = username
+                                    # Ensure unique, including accounts created earlier in this import
+                                    base_username = username = row.username
                                     counter = 1
-                                    while username in data_manager.users:
+                                    while username in taken_usernames:
                                         username = f"{base_username}{counter}"
                                         counter += 1
-                                    
-                                    temp_password = auth.generate_temporary_password()
-                                    password_hash, salt = auth.hash_password(temp_password)
-                                    
-                                    new_user = User(
-                                        username=username,
-                                        password_hash=password_hash,
-                                        salt=salt,
-                                        employee_id=emp_id,
-                                        role="employee",
-                                        is_active=True
-                                    )
-                                    
-                                    data_manager.add_user(new_user)
+                                    taken_usernames.add(username)
+                                
+                                    temp_password = AuthManager.generate_temporary_password()
+                                    pending_accounts.append((username, emp_id, temp_password))
                                     created_users.append({
-                                        "name": str(row.get('name', '')),
+                                        "name": row.name,
                                         "username": username,
                                         "password": temp_password
                                     })
-                                
+                            
                             except Exception as e:
                                 error_count += 1
-                                st.error(f"Error on row {i+1}: {str(e)}")
+                                import_errors.append(f"Error on row {i+1}: {str(e)}")
+                        
+                        # Hash all temporary passwords together so the slow KDF runs in parallel
+                        password_hashes = AuthManager.hash_passwords([password for _, _, password in pending_accounts])
+                        for (username, emp_id, _), (password_hash, salt) in zip(pending_accounts, password_hashes):
+                            new_users.append(User(
+                                username=username,
+                                password_hash=password_hash,
+                                salt=salt,
+                                employee_id=emp_id,
+                                role="employee",
+                                is_active=True
+                            ))
+                        
+                        with data_manager.batch():
+                            data_manager.add_employees_bulk(new_employees)
+                            data_manager.add_users_bulk(new_users)
                         
                         progress_bar.empty()
                         
+                        for message in import_errors:
+                            st.error(message)
+                        
                         st.success(f"✅ Import Complete!")
                         st.markdown(f"""
                         **Results:**
@@ -1371,13 +2165,13 @@ def render_employee_management(data_manager: DataManager):
             
             if uploaded_file is not None:
                 try:
-                    data = json.load(uploaded_file)
+                    data = _json_loads(uploaded_file.getvalue())
                     
                     st.markdown(f"**Preview:** Found {len(data)} leave record(s)")
                     
                     # Show preview
                     preview_data = []
-                    for leave_id, leave_data in list(data.items())[:5]:
+                    for leave_id, leave_data in islice(data.items(), 5):
                         emp = data_manager.employees.get(leave_data.get("employee_id", ""))
                         preview_data.append({
                             "ID": leave_id,
@@ -1409,16 +2203,28 @@ def render_employee_management(data_manager: DataManager):
                         progress_bar = st.progress(0)
                         status_text = st.empty()
                         
+                        # Snapshot employee ids once instead of probing data_manager per row
+                        employees = data_manager.employees
+                        valid_ids = frozenset(employees)
+                        # One timestamp for the whole batch, used for missing dates
+                        now = datetime.now()
+                        today_str = now.strftime("%Y-%m-%d")
+                        submitted_date = now.strftime("%Y-%m-%d %H:%M:%S")
+                        current_user = st.session_state.current_user
+                        
+                        new_requests = []
+                        balance_deltas = defaultdict(float)
+                        progress_step = max(1, len(data) // 100)
                         for i, (leave_id, leave_data) in enumerate(data.items()):
-                            progress = (i + 1) / len(data)
-                            progress_bar.progress(progress)
+                            if i % progress_step == 0 or i == len(data) - 1:
+                                progress_bar.progress((i + 1) / len(data))
+                                status_text.text(f"Processing {i+1} of {len(data)}: {leave_id}")
                             
                             emp_id = leave_data.get("employee_id", "")
-                            status_text.text(f"Processing {i+1} of {len(data)}: {leave_id}")
                             
                             try:
                                 # Check if employee exists
-                                if emp_id not in data_manager.employees:
+                                if emp_id not in valid_ids:
                                     if skip_invalid:
                                         skipped_count += 1
                                         invalid_employees.append(emp_id)
@@ -1427,35 +2233,44 @@ def render_employee_management(data_manager: DataManager):
                                         st.warning(f"Employee {emp_id} not found, but importing anyway")
                                 
                                 # Create LeaveRequest object
+                                emp = employees.get(emp_id)
                                 leave_request = LeaveRequest(
                                     id=leave_data.get("id", leave_id),
                                     employee_id=emp_id,
+                                    employee_name=leave_data.get("employee_name") or (emp.name if emp else ""),
                                     leave_type=leave_data.get("leave_type", "Annual Leave"),
-                                    start_date=leave_data.get("start_date", datetime.now().strftime("%Y-%m-%d")),
-                                    end_date=leave_data.get("end_date", datetime.now().strftime("%Y-%m-%d")),
+                                    start_date=leave_data.get("start_date", today_str),
+                                    end_date=leave_data.get("end_date", today_str),
                                     days_requested=leave_data.get("days_requested", 0),
                                     reason=leave_data.get("reason", ""),
                                     status=leave_data.get("status", "Pending"),
-                                    submitted_date=leave_data.get("submitted_date", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+                                    submitted_date=leave_data.get("submitted_date", submitted_date),
+                                    submitted_by=leave_data.get("submitted_by") or current_user,
                                     approved_by=leave_data.get("approved_by"),
-                                    approved_date=leave_data.get("approved_date"),
-                                    comments=leave_data.get("comments", "")
+                                    approval_date=leave_data.get("approval_date", leave_data.get("approved_date")),
+                                    remarks=leave_data.get("remarks", leave_data.get("comments", ""))
                                 )
+                                # Parse the dates now so a malformed record fails here, not in the index
+                                _ = leave_request.start_ord, leave_request.end_ord
                                 
-                                data_manager.add_leave_request(leave_request)
+                                new_requests.append(leave_request)
                                 success_count += 1
                                 
                                 # Update leave balance if requested and approved
-                                if update_balance and leave_request.status == "Manager_Approved":
-                                    emp = data_manager.employees.get(emp_id)
-                                    if emp:
-                                        new_balance = emp.annual_leave_balance - leave_request.days_requested
-                                        data_manager.update_employee(emp_id, annual_leave_balance=new_balance)
-                                
+                                if update_balance and leave_request.status == "Manager_Approved" and emp:
+                                    balance_deltas[emp_id] += leave_request.days_requested
+                            
                             except Exception as e:
                                 error_count += 1
                                 st.error(f"Error importing {leave_id}: {str(e)}")
                         
+                        with data_manager.batch():
+                            data_manager.add_leave_requests_bulk(new_requests)
+                            for emp_id, days in balance_deltas.items():
+                                data_manager.update_employee(
+                                    emp_id, annual_leave_balance=employees[emp_id].annual_leave_balance - days
+                                )
+                        
                         progress_bar.empty()
                         status_text.empty()
                         
@@ -1494,13 +2309,6 @@ def render_employee_management(data_manager: DataManager):
             
             if uploaded_file is not None:
                 try:
-                    if uploaded_file.name.endswith('.csv'):
-                        df = pd.read_csv(uploaded_file)
-                    else:
-                        df = pd.read_excel(uploaded_file)
-                    
-                    st.markdown(f"**Preview:** {len(df)} leave record(s) found")
-                    
                     # Map common column name variations
                     column_mapping = {
                         'employee id': 'employee_id',
@@ -1519,10 +2327,21 @@ def render_employee_management(data_manager: DataManager):
                         'number_of_days': 'days_requested'
                     }
                     
-                    # Rename columns (case insensitive)
-                    df.columns = [column_mapping.get(col.lower().strip(), col) for col in df.columns]
+                    def normalize_columns(frame):
+                        # Rename columns (case insensitive)
+                        frame.columns = [column_mapping.get(col.lower().strip(), col) for col in frame.columns]
+                        return frame
                     
-                    st.dataframe(df.head(10))
+                    # Stream the file in chunks (cells as text) so only one chunk is held at a time
+                    total_rows = 0
+                    preview_df = None
+                    for chunk in _iter_import_chunks(uploaded_file):
+                        if preview_df is None:
+                            preview_df = normalize_columns(chunk.head(10))
+                        total_rows += len(chunk)
+                    
+                    st.markdown(f"**Preview:** {total_rows} leave record(s) found")
+                    st.dataframe(preview_df)
                     
                     # Import options
                     col1, col2 = st.columns(2)
@@ -1539,84 +2358,101 @@ def render_employee_management(data_manager: DataManager):
                         
                         progress_bar = st.progress(0)
                         
-                        for i, row in df.iterrows():
-                            progress = (i + 1) / len(df)
-                            progress_bar.progress(progress)
+                        # Normalize whole columns up front (blank cells take the default);
+                        # the row loop below only builds LeaveRequest objects
+                        def column(frame, name, default=""):
+                            if name not in frame.columns:
+                                return pd.Series(default, index=frame.index, dtype=object)
+                            return frame[name].mask(frame[name] == "", default)
+                        
+                        now = datetime.now()
+                        today_str = now.strftime("%Y-%m-%d")
+                        submitted_date = now.strftime("%Y-%m-%d %H:%M:%S")
+                        current_user = st.session_state.current_user
+                        # Snapshot employee ids once instead of probing data_manager per row
+                        employees = data_manager.employees
+                        valid_ids = frozenset(employees)
+                        
+                        new_requests = []
+                        balance_deltas = defaultdict(float)
+                        progress_step = max(1, total_rows // 100)
+                        offset = 0
+                        for df in _iter_import_chunks(uploaded_file):
+                            normalize_columns(df)
+                            default_ids = pd.Series(
+                                [f"LEAVE{offset+i+1:05d}" for i in range(len(df))], index=df.index
+                            )
+                            employee_ids = column(df, "employee_id")
+                            records = pd.DataFrame({
+                                "id": df["id"].mask(df["id"] == "", default_ids) if "id" in df.columns else default_ids,
+                                "employee_id": employee_ids,
+                                "employee_name": column(df, "employee_name"),
+                                "leave_type": column(df, "leave_type", "Annual Leave"),
+                                "start_date": _parse_import_dates(column(df, "start_date", today_str)),
+                                "end_date": _parse_import_dates(column(df, "end_date", today_str)),
+                                "days_requested": pd.to_numeric(column(df, "days_requested", "0"), errors="coerce").fillna(0).astype(int),
+                                "reason": column(df, "reason"),
+                                "status": column(df, "status").str.lower().map(IMPORT_STATUS_ALIASES).fillna("Pending"),
+                                "approved_by": column(df, "approved_by"),
+                                "approval_date": column(df, "approved_date"),
+                                "remarks": column(df, "comments"),
+                                "known_employee": employee_ids.isin(valid_ids),
+                            })
                             
-                            try:
-                                leave_id = str(row.get('id', f"LEAVE{i+1:05d}"))
-                                emp_id = str(row.get('employee_id', ''))
-                                
-                                # Check if employee exists
-                                if emp_id not in data_manager.employees:
-                                    if skip_invalid:
-                                        skipped_count += 1
-                                        invalid_employees.append(emp_id)
-                                        continue
-                                
-                                # Parse dates
-                                start_date = str(row.get('start_date', ''))
-                                end_date = str(row.get('end_date', ''))
+                            for i, row in enumerate(records.itertuples(index=False), offset):
+                                if i % progress_step == 0 or i == total_rows - 1:
+                                    progress_bar.progress(min(1.0, (i + 1) / max(1, total_rows)))
                                 
-                                # Try different date formats
-                                for fmt in ["%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y"]:
-                                    try:
-                                        if pd.notna(row.get('start_date')):
-                                            start_date = pd.to_datetime(row.get('start_date')).strftime("%Y-%m-%d")
-                                        if pd.notna(row.get('end_date')):
-                                            end_date = pd.to_datetime(row.get('end_date')).strftime("%Y-%m-%d")
-                                        break
-                                    except:
-                                        continue
-                                
-                                # Get days requested
-                                days = row.get('days_requested', 0)
-                                if pd.isna(days):
-                                    days = 0
-                                else:
-                                    days = int(float(days))
-                                
-                                # Get status with default
-                                status = str(row.get('status', 'Pending'))
-                                if status.lower() in ['approved', 'manager_approved', 'final approved']:
-                                    status = 'Manager_Approved'
-                                elif status.lower() in ['admin_approved', 'level 1 approved']:
-                                    status = 'Admin_Approved'
-                                elif status.lower() in ['rejected', 'declined', 'denied']:
-                                    status = 'Rejected'
-                                elif status.lower() in ['cancelled', 'canceled']:
-                                    status = 'Cancelled'
-                                else:
-                                    status = 'Pending'
+                                try:
+                                    emp_id = row.employee_id
+                                    
+                                    # Check if employee exists
+                                    if not row.known_employee:
+                                        if skip_invalid:
+                                            skipped_count += 1
+                                            invalid_employees.append(emp_id)
+                                            continue
+                                    
+                                    if pd.isna(row.start_date) or pd.isna(row.end_date):
+                                        raise ValueError("unrecognized start or end date")
+                                    
+                                    emp = employees.get(emp_id)
+                                    leave_request = LeaveRequest(
+                                        id=row.id,
+                                        employee_id=emp_id,
+                                        employee_name=emp.name if emp else row.employee_name,
+                                        leave_type=row.leave_type,
+                                        start_date=row.start_date,
+                                        end_date=row.end_date,
+                                        days_requested=row.days_requested,
+                                        reason=row.reason,
+                                        status=row.status,
+                                        submitted_date=submitted_date,
+                                        submitted_by=current_user,
+                                        approved_by=row.approved_by or None,
+                                        approval_date=row.approval_date or None,
+                                        remarks=row.remarks
+                                    )
+                                    
+                                    new_requests.append(leave_request)
+                                    success_count += 1
+                                    
+                                    # Update leave balance if requested and approved
+                                    if update_balance and row.status == 'Manager_Approved' and emp:
+                                        balance_deltas[emp_id] += row.days_requested
                                 
-                                leave_request = LeaveRequest(
-                                    id=leave_id,
-                                    employee_id=emp_id,
-                                    leave_type=str(row.get('leave_type', 'Annual Leave')),
-                                    start_date=start_date if start_date else datetime.now().strftime("%Y-%m-%d"),
-                                    end_date=end_date if end_date else datetime.now().strftime("%Y-%m-%d"),
-                                    days_requested=days,
-                                    reason=str(row.get('reason', '')) if pd.notna(row.get('reason')) else '',
-                                    status=status,
-                                    submitted_date=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                    approved_by=str(row.get('approved_by')) if pd.notna(row.get('approved_by')) else None,
-                                    approved_date=str(row.get('approved_date')) if pd.notna(row.get('approved_date')) else None,
-                                    comments=str(row.get('comments', '')) if pd.notna(row.get('comments')) else ''
+                                except Exception as e:
+                                    error_count += 1
+                                    st.error(f"Error on row {i+1}: {str(e)}")
+                            
+                            offset += len(df)
+                        
+                        with data_manager.batch():
+                            data_manager.add_leave_requests_bulk(new_requests)
+                            for emp_id, days in balance_deltas.items():
+                                data_manager.update_employee(
+                                    emp_id, annual_leave_balance=employees[emp_id].annual_leave_balance - days
                                 )
-                                
-                                data_manager.add_leave_request(leave_request)
-                                success_count += 1
-                                
-                                # Update leave balance if requested and approved
-                                if update_balance and status == 'Manager_Approved':
-                                    emp = data_manager.employees.get(emp_id)
-                                    if emp:
-                                        new_balance = emp.annual_leave_balance - days
-                                        data_manager.update_employee(emp_id, annual_leave_balance=new_balance)
-                                
-                            except Exception as e:
-                                error_count += 1
-                                st.error(f"Error on row {i+1}: {str(e)}")
                         
                         progress_bar.empty()
                         
@@ -1649,47 +2485,22 @@ def render_leave_request(data_manager: DataManager, calculator: LeaveCalculator)
         col1, col2 = st.columns(2)
         
         with col1:
-            employee = st.selectbox(
+            employee_labels = get_active_employee_labels_cached(data_manager, data_manager.version)
+            employee_id = st.selectbox(
                 "Select Employee",
-                options=[e for e in data_manager.employees.values() if e.status == "Active"],
-                format_func=lambda x: f"{x.name} ({x.department}) - Balance: {x.annual_leave_balance} days"
+                options=list(employee_labels),
+                format_func=employee_labels.__getitem__
             )
+            employee = data_manager.employees.get(employee_id)
             
             leave_type = st.selectbox(
                 "Leave Type",
-                options=list(LEAVE_TYPES.keys()),
-                format_func=lambda x: f"{x} - {LEAVE_TYPES[x]['description']}"
+                options=LEAVE_TYPE_NAMES,
+                format_func=LEAVE_TYPE_LABELS.__getitem__
             )
             
             # Show detailed UAE law information
-            leave_info = LEAVE_TYPES[leave_type]
-            st.markdown(f"""
-            <div style="background-color: #1e3a5f; padding: 15px; border-radius: 8px; border: 1px solid #4a90d9; margin: 10px 0;">
-                <h4 style="color: #ffffff; margin: 0 0 10px 0;">📋 {leave_type}</h4>
-                <table style="width: 100%; color: #e0e0e0; font-size: 13px;">
-                    <tr>
-                        <td style="padding: 4px; width: 30%;"><strong>🇦🇪 UAE Law:</strong></td>
-                        <td style="padding: 4px;">{leave_info['uae_law']}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 4px;"><strong>📊 Entitlement:</strong></td>
-                        <td style="padding: 4px;">{leave_info['entitlement']}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 4px;"><strong>💰 Payment:</strong></td>
-                        <td style="padding: 4px;">{leave_info['payment']}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 4px;"><strong>📋 Requirements:</strong></td>
-                        <td style="padding: 4px;">{leave_info['requirements']}</td>
-                    </tr>
-                    <tr>
-                        <td style="padding: 4px;"><strong>🔄 Carry Forward:</strong></td>
-                        <td style="padding: 4px;">{leave_info['carry_forward']}</td>
-                    </tr>
-                </table>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(LEAVE_INFO_CARDS[leave_type], unsafe_allow_html=True)
             
             col_date1, col_date2 = st.columns(2)
             with col_date1:
@@ -1700,12 +2511,12 @@ def render_leave_request(data_manager: DataManager, calculator: LeaveCalculator)
         with col2:
             # Calculate days
             calendar_days = calculator.calculate_calendar_days(
-                start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d")
+                start_date,
+                end_date
             )
             working_days = calculator.calculate_working_days(
-                start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d")
+                start_date,
+                end_date
             )
             
             st.metric("Calendar Days", calendar_days)
@@ -1714,7 +2525,7 @@ def render_leave_request(data_manager: DataManager, calculator: LeaveCalculator)
             # Days to request based on leave type (UAE Law)
             # Working days: Parental Leave, Study Leave (as per UAE law)
             # Calendar days: Annual Leave, Sick Leave, Maternity Leave, Bereavement Leave, etc.
-            if leave_type in ["Parental Leave", "Study Leave"]:
+            if leave_type in WORKING_DAY_LEAVE_TYPES:
                 days_requested = working_days  # Working days per UAE law
             else:
                 days_requested = calendar_days  # Calendar days for all other leave types
@@ -1737,16 +2548,17 @@ def render_leave_request(data_manager: DataManager, calculator: LeaveCalculator)
             has_conflict, conflict_message, conflict_details = calculator.check_conflicts(
                 data_manager,
                 employee.id,
-                start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d")
+                start_date,
+                end_date
             )
             
             # Check department conflicts
-            dept_conflicts = calculator.get_department_conflicts(
+            dept_conflicts = get_department_conflicts_cached(
                 data_manager,
+                data_manager.version,
                 employee.department,
-                start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d"),
+                start_date,
+                end_date,
                 employee.id
             )
             
@@ -1819,7 +2631,7 @@ def render_leave_approvals(data_manager: DataManager):
     tab1, tab2, tab3 = st.tabs(["Pending Requests", "Approved Leaves", "All Requests"])
     
     with tab1:
-        pending = [r for r in data_manager.leave_requests.values() if r.status == "Pending"]
+        pending = data_manager.get_requests_by_status("Pending")
         
         if pending:
             for req in pending:
@@ -1866,25 +2678,24 @@ def render_leave_approvals(data_manager: DataManager):
             st.info("No pending leave requests.")
     
     with tab2:
-        approved = [r for r in data_manager.leave_requests.values() if r.status == "Manager_Approved"]
+        approved = data_manager.get_requests_by_status("Manager_Approved")
         
         if approved:
-            approved_data = []
-            for req in approved:
-                emp = data_manager.employees.get(req.employee_id)
-                approved_data.append({
-                    "ID": req.id,
-                    "Name": req.employee_name,
-                    "Department": emp.department if emp else "N/A",
-                    "Leave Type": req.leave_type,
-                    "From": req.start_date,
-                    "To": req.end_date,
-                    "Days": req.days_requested,
-                    "Approved By": req.approved_by,
-                    "Approved On": req.approval_date,
-                })
-            
-            df = pd.DataFrame(approved_data)
+            # Build the table column-wise from the shared requests frame
+            requests_df = data_manager.get_requests_frame()
+            approved_df = requests_df[requests_df["status"] == "Manager_Approved"]
+            department_of = data_manager.get_department_map()
+            df = pd.DataFrame({
+                "ID": approved_df["id"],
+                "Name": approved_df["employee_name"],
+                "Department": approved_df["employee_id"].map(department_of).fillna("N/A"),
+                "Leave Type": approved_df["leave_type"],
+                "From": approved_df["start_date"].dt.strftime("%Y-%m-%d"),
+                "To": approved_df["end_date"].dt.strftime("%Y-%m-%d"),
+                "Days": approved_df["days_requested"],
+                "Approved By": approved_df["approved_by"],
+                "Approved On": approved_df["approval_date"],
+            }).reset_index(drop=True)
             st.dataframe(df, use_container_width=True)
             
             # Cancel approved leave
@@ -1911,9 +2722,7 @@ def render_leave_approvals(data_manager: DataManager):
             st.info("No approved leaves.")
     
     with tab3:
-        all_requests = list(data_manager.leave_requests.values())
-        
-        if all_requests:
+        if data_manager.leave_requests:
             # Filter options
             col1, col2 = st.columns(2)
             with col1:
@@ -1925,33 +2734,29 @@ def render_leave_approvals(data_manager: DataManager):
             with col2:
                 type_filter = st.multiselect(
                     "Filter by Leave Type",
-                    options=list(LEAVE_TYPES.keys()),
+                    options=LEAVE_TYPE_NAMES,
                     default=[]
                 )
             
-            all_data = []
-            for req in all_requests:
-                emp = data_manager.employees.get(req.employee_id)
-                
-                # Apply filters
-                if status_filter and req.status not in status_filter:
-                    continue
-                if type_filter and req.leave_type not in type_filter:
-                    continue
-                
-                all_data.append({
-                    "ID": req.id,
-                    "Name": req.employee_name,
-                    "Department": emp.department if emp else "N/A",
-                    "Leave Type": req.leave_type,
-                    "From": req.start_date,
-                    "To": req.end_date,
-                    "Days": req.days_requested,
-                    "Status": req.status,
-                    "Submitted": req.submitted_date,
-                })
+            # Filter the shared requests frame instead of walking every request
+            requests_df = data_manager.get_requests_frame()
+            if status_filter:
+                requests_df = requests_df[requests_df["status"].isin(status_filter)]
+            if type_filter:
+                requests_df = requests_df[requests_df["leave_type"].isin(type_filter)]
             
-            df = pd.DataFrame(all_data)
+            department_of = data_manager.get_department_map()
+            df = pd.DataFrame({
+                "ID": requests_df["id"],
+                "Name": requests_df["employee_name"],
+                "Department": requests_df["employee_id"].map(department_of).fillna("N/A"),
+                "Leave Type": requests_df["leave_type"],
+                "From": requests_df["start_date"].dt.strftime("%Y-%m-%d"),
+                "To": requests_df["end_date"].dt.strftime("%Y-%m-%d"),
+                "Days": requests_df["days_requested"],
+                "Status": requests_df["status"],
+                "Submitted": requests_df["submitted_date"],
+            }).reset_index(drop=True)
             st.dataframe(df, use_container_width=True)
             
             # Export option
@@ -1967,6 +2772,26 @@ def render_leave_approvals(data_manager: DataManager):
             st.info("No leave requests found.")
 
 
+# Row templates filled per leave with str.format (keys match the leave dicts / format arguments)
+CALENDAR_ROW_HTML = """
+            <div style="display: flex; align-items: center; margin: 5px 0; padding: 8px; 
+                        background-color: {color}20; border-left: 4px solid {color}; 
+                        border-radius: 4px;">
+                <div style="flex: 1;">
+                    <strong>{employee_name}</strong> ({department})<br>
+                    <small>{leave_type} - {start_date} to {end_date}</small>
+                </div>
+            </div>
+            """
+REPORT_LEAVE_DETAIL_HTML = """
+                            <div style="background-color: #1e3a5f; padding: 10px; border-radius: 5px; margin: 5px 0; border-left: 4px solid #4a90d9;">
+                                <strong>#{number} - {leave_type}</strong> ({days} days)<br>
+                                <span style="color: #aaaaaa;">📅 {start_date} to {end_date} | Month: {month}</span><br>
+                                <span style="color: #aaaaaa;">💬 {reason}</span>
+                            </div>
+                            """
+
+
 def render_leave_calendar(data_manager: DataManager):
     """Render leave calendar view"""
     st.header("📅 Leave Calendar")
@@ -1979,7 +2804,7 @@ def render_leave_calendar(data_manager: DataManager):
         selected_month = st.selectbox("Month", options=range(1, 13), index=datetime.now().month - 1)
     
     # Department filter
-    departments = list(set(e.department for e in data_manager.employees.values()))
+    departments = data_manager.get_departments()
     selected_depts = st.multiselect("Filter by Department", options=departments, default=departments)
     
     # Get approved leaves for the selected month
@@ -1989,21 +2814,27 @@ def render_leave_calendar(data_manager: DataManager):
     else:
         month_end = datetime(selected_year, selected_month + 1, 1) - timedelta(days=1)
     
+    # Range query on the sorted interval index instead of scanning every approved request
     approved_leaves = [
-        r for r in data_manager.leave_requests.values()
+        r for r in data_manager.get_active_requests_between(month_start, month_end)
         if r.status == "Manager_Approved"
-        and datetime.strptime(r.start_date, "%Y-%m-%d") <= month_end
-        and datetime.strptime(r.end_date, "%Y-%m-%d") >= month_start
     ]
+    approved_leaves.sort(key=lambda r: r.start_ord)
     
-    # Filter by department
+    # Filter by department, tallying the summary figures in the same pass
+    department_of = data_manager.get_department_map()
+    selected_set = frozenset(selected_depts)
     filtered_leaves = []
+    employees_on_leave = set()
+    leave_by_type = Counter()
     for req in approved_leaves:
-        emp = data_manager.employees.get(req.employee_id)
-        if emp and emp.department in selected_depts:
+        department = department_of.get(req.employee_id)
+        if department in selected_set:
+            employees_on_leave.add(req.employee_name)
+            leave_by_type[req.leave_type] += 1
             filtered_leaves.append({
                 "employee_name": req.employee_name,
-                "department": emp.department,
+                "department": department,
                 "leave_type": req.leave_type,
                 "start_date": req.start_date,
                 "end_date": req.end_date,
@@ -2014,30 +2845,9 @@ def render_leave_calendar(data_manager: DataManager):
     if filtered_leaves:
         st.subheader(f"Leave Overview - {month_start.strftime('%B %Y')}")
         
-        # Create a day-by-day view
-        days_in_month = (month_end - month_start).days + 1
-        
-        for leave in filtered_leaves:
-            leave_start = datetime.strptime(leave["start_date"], "%Y-%m-%d")
-            leave_end = datetime.strptime(leave["end_date"], "%Y-%m-%d")
-            
-            # Clip to month boundaries
-            display_start = max(leave_start, month_start)
-            display_end = min(leave_end, month_end)
-            
-            start_day = display_start.day
-            end_day = display_end.day
-            
-            st.markdown(f"""
-            <div style="display: flex; align-items: center; margin: 5px 0; padding: 8px; 
-                        background-color: {leave['color']}20; border-left: 4px solid {leave['color']}; 
-                        border-radius: 4px;">
-                <div style="flex: 1;">
-                    <strong>{leave['employee_name']}</strong> ({leave['department']})<br>
-                    <small>{leave['leave_type']} - {leave['start_date']} to {leave['end_date']}</small>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+        # Fill the row template per leave and send them as one markdown element
+        rows_html = [CALENDAR_ROW_HTML.format_map(leave) for leave in filtered_leaves]
+        st.markdown("".join(rows_html), unsafe_allow_html=True)
         
         # Summary statistics
         st.subheader("Monthly Summary")
@@ -2046,19 +2856,63 @@ def render_leave_calendar(data_manager: DataManager):
         with col1:
             st.metric("Total Leave Requests", len(filtered_leaves))
         with col2:
-            unique_employees = len(set(l["employee_name"] for l in filtered_leaves))
-            st.metric("Employees on Leave", unique_employees)
+            st.metric("Employees on Leave", len(employees_on_leave))
         with col3:
-            leave_by_type = {}
-            for l in filtered_leaves:
-                lt = l["leave_type"]
-                leave_by_type[lt] = leave_by_type.get(lt, 0) + 1
-            most_common = max(leave_by_type.items(), key=lambda x: x[1])[0] if leave_by_type else "N/A"
+            # Ties go to the type seen first, as before
+            most_common = leave_by_type.most_common(1)[0][0] if leave_by_type else "N/A"
             st.metric("Most Common Leave", most_common)
     else:
         st.info(f"No approved leaves for {month_start.strftime('%B %Y')} in selected departments.")
 
 
+# Static text of the entitlements guide, formatted once at import
+SPECIAL_LEAVES = {
+    "Maternity Leave": {
+        "duration": "60 Calendar Days",
+        "pay": "45 days full pay + 15 days half pay",
+        "notes": "For female employees"
+    },
+    "Parental Leave": {
+        "duration": "5 Working Days",
+        "pay": "Full pay",
+        "notes": "Within first 6 months of child's birth (either parent)"
+    },
+    "Sick Leave": {
+        "duration": "Up to 90 Calendar Days/year",
+        "pay": "15 days full + 30 days half + 45 days no pay",
+        "notes": "Medical certificate required from first day"
+    },
+    "Bereavement Leave": {
+        "duration": "3-5 Days",
+        "pay": "Full pay",
+        "notes": "Death of spouse (5 days), parent/child/sibling/grandparent/grandchild (3 days)"
+    },
+    "Hajj Leave": {
+        "duration": "Up to 30 Days",
+        "pay": "Unpaid",
+        "notes": "Once during entire employment period"
+    },
+    "Study Leave": {
+        "duration": "10 Working Days/year",
+        "pay": "Full pay",
+        "notes": "For employees in UAE-accredited educational institutions"
+    },
+}
+SPECIAL_LEAVE_NOTES = MappingProxyType({
+    name: f"**Duration:** {details['duration']}\n\n**Payment:** {details['pay']}\n\n**Notes:** {details['notes']}"
+    for name, details in SPECIAL_LEAVES.items()
+})
+
+KEY_PROVISIONS = (
+    ("🔄 Carry Forward", "Employees can carry forward unused leave to the next year with employer consent and payment for unused days."),
+    ("⏰ Time Limit", "Employer cannot prevent employee from using accrued annual leave for more than 2 consecutive years."),
+    ("💰 Leave Encashment", "Unused leave upon termination must be paid based on basic salary, regardless of duration."),
+    ("📅 Public Holidays", "Public holidays during annual leave count as part of the leave unless company policy is more favorable."),
+    ("⚠️ Fractional Leave", "Employees leaving before using leave are entitled to payment for the fraction of the last year worked."),
+)
+KEY_PROVISIONS_MARKDOWN = "\n\n".join(f"**{icon_title}** - {description}" for icon_title, description in KEY_PROVISIONS)
+
+
 def render_leave_entitlements():
     """Render UAE leave entitlements information"""
     st.header("📖 UAE Leave Entitlements Guide")
@@ -2125,27 +2979,11 @@ def render_leave_entitlements():
         with col2:
             daily_wage = basic_salary / 30
             
-            if sick_days <= 15:
-                paid_days = sick_days
-                half_days = 0
-                unpaid_days = 0
-                full_pay = daily_wage * paid_days
-                half_pay = 0
-                total_pay = full_pay
-            elif sick_days <= 45:
-                paid_days = 15
-                half_days = sick_days - 15
-                unpaid_days = 0
-                full_pay = daily_wage * paid_days
-                half_pay = (daily_wage * 0.5) * half_days
-                total_pay = full_pay + half_pay
-            else:
-                paid_days = 15
-                half_days = 30
-                unpaid_days = sick_days - 45
-                full_pay = daily_wage * paid_days
-                half_pay = (daily_wage * 0.5) * half_days
-                total_pay = full_pay + half_pay
+            # Pay bands: days 1-15 full pay, 16-45 half pay, 46-90 unpaid
+            paid_days = min(sick_days, 15)
+            half_days = min(max(sick_days - 15, 0), 30)
+            unpaid_days = max(sick_days - 45, 0)
+            total_pay = daily_wage * (paid_days + 0.5 * half_days)
             
             st.metric("Daily Wage", f"AED {daily_wage:.2f}")
             st.metric("Total Pay for Sick Period", f"AED {total_pay:.2f}")
@@ -2154,58 +2992,14 @@ def render_leave_entitlements():
     with tabs[2]:
         st.subheader("🍼 Special Leave Types")
         
-        special_leaves = {
-            "Maternity Leave": {
-                "duration": "60 Calendar Days",
-                "pay": "45 days full pay + 15 days half pay",
-                "notes": "For female employees"
-            },
-            "Parental Leave": {
-                "duration": "5 Working Days",
-                "pay": "Full pay",
-                "notes": "Within first 6 months of child's birth (either parent)"
-            },
-            "Sick Leave": {
-                "duration": "Up to 90 Calendar Days/year",
-                "pay": "15 days full + 30 days half + 45 days no pay",
-                "notes": "Medical certificate required from first day"
-            },
-            "Bereavement Leave": {
-                "duration": "3-5 Days",
-                "pay": "Full pay",
-                "notes": "Death of spouse (5 days), parent/child/sibling/grandparent/grandchild (3 days)"
-            },
-            "Hajj Leave": {
-                "duration": "Up to 30 Days",
-                "pay": "Unpaid",
-                "notes": "Once during entire employment period"
-            },
-            "Study Leave": {
-                "duration": "10 Working Days/year",
-                "pay": "Full pay",
-                "notes": "For employees in UAE-accredited educational institutions"
-            },
-        }
-        
-        for leave_name, details in special_leaves.items():
+        for leave_name, notes in SPECIAL_LEAVE_NOTES.items():
             with st.expander(f"📌 {leave_name}"):
-                st.write(f"**Duration:** {details['duration']}")
-                st.write(f"**Payment:** {details['pay']}")
-                st.write(f"**Notes:** {details['notes']}")
+                st.markdown(notes)
     
     with tabs[3]:
         st.subheader("⚖️ Key Legal Provisions")
         
-        provisions = [
-            ("🔄 Carry Forward", "Employees can carry forward unused leave to the next year with employer consent and payment for unused days."),
-            ("⏰ Time Limit", "Employer cannot prevent employee from using accrued annual leave for more than 2 consecutive years."),
-            ("💰 Leave Encashment", "Unused leave upon termination must be paid based on basic salary, regardless of duration."),
-            ("📅 Public Holidays", "Public holidays during annual leave count as part of the leave unless company policy is more favorable."),
-            ("⚠️ Fractional Leave", "Employees leaving before using leave are entitled to payment for the fraction of the last year worked."),
-        ]
-        
-        for icon_title, description in provisions:
-            st.markdown(f"**{icon_title}** - {description}")
+        st.markdown(KEY_PROVISIONS_MARKDOWN)
     
     with tabs[4]:
         st.subheader("🧮 Leave Calculation Examples")
@@ -2241,42 +3035,37 @@ def render_reports(data_manager: DataManager):
     """Render reports and analytics section"""
     st.header("📊 Reports & Analytics")
     
+    if not data_manager.leave_requests:
+        st.info("No leave requests to report on yet.")
+        return
+    
+    # Shared by all tabs (they all run on every rerun): the requests frame and its
+    # approved rows; aggregations group over these (groups keep first-seen order)
+    requests_df = data_manager.get_requests_frame()
+    approved_df = requests_df[requests_df["status"] == "Manager_Approved"]
+    
     tab1, tab2, tab3, tab4 = st.tabs(["Leave Summary", "Department Analysis", "Employee Report", "Leave Calendar Report"])
     
     with tab1:
         st.subheader("Leave Summary by Type")
         
-        approved_requests = [r for r in data_manager.leave_requests.values() if r.status == "Manager_Approved"]
-        
-        if approved_requests:
+        if not approved_df.empty:
             # Summary by leave type
-            leave_summary = defaultdict(lambda: {"count": 0, "total_days": 0})
-            for req in approved_requests:
-                leave_summary[req.leave_type]["count"] += 1
-                leave_summary[req.leave_type]["total_days"] += req.days_requested
-            
-            summary_data = []
-            for leave_type, data in leave_summary.items():
-                summary_data.append({
-                    "Leave Type": leave_type,
-                    "Number of Requests": data["count"],
-                    "Total Days": data["total_days"],
-                    "Average Days": round(data["total_days"] / data["count"], 1) if data["count"] > 0 else 0
-                })
-            
-            df = pd.DataFrame(summary_data)
+            leave_summary = approved_df.groupby("leave_type", sort=False).agg(
+                count=("id", "size"), total_days=("days_requested", "sum")
+            )
+            df = pd.DataFrame({
+                "Leave Type": leave_summary.index,
+                "Number of Requests": leave_summary["count"].values,
+                "Total Days": leave_summary["total_days"].values,
+                "Average Days": (leave_summary["total_days"] / leave_summary["count"]).round(1).values,
+            })
             st.dataframe(df, use_container_width=True)
             
             # Monthly trend
             st.subheader("Monthly Leave Trend")
-            monthly_data = defaultdict(int)
-            for req in approved_requests:
-                month_key = datetime.strptime(req.start_date, "%Y-%m-%d").strftime("%Y-%m")
-                monthly_data[month_key] += req.days_requested
-            
-            trend_df = pd.DataFrame([
-                {"Month": k, "Total Days": v} for k, v in sorted(monthly_data.items())
-            ])
+            monthly_data = approved_df.groupby(approved_df["start_date"].dt.strftime("%Y-%m"))["days_requested"].sum()
+            trend_df = pd.DataFrame({"Month": monthly_data.index, "Total Days": monthly_data.values})
             st.line_chart(trend_df.set_index("Month"))
         else:
             st.info("No approved leaves to analyze.")
@@ -2284,26 +3073,18 @@ def render_reports(data_manager: DataManager):
     with tab2:
         st.subheader("Department Analysis")
         
-        if approved_requests:
-            dept_summary = defaultdict(lambda: {"requests": 0, "days": 0, "employees": set()})
-            
-            for req in approved_requests:
-                emp = data_manager.employees.get(req.employee_id)
-                if emp:
-                    dept_summary[emp.department]["requests"] += 1
-                    dept_summary[emp.department]["days"] += req.days_requested
-                    dept_summary[emp.department]["employees"].add(req.employee_id)
-            
-            dept_data = []
-            for dept, data in dept_summary.items():
-                dept_data.append({
-                    "Department": dept,
-                    "Leave Requests": data["requests"],
-                    "Total Days": data["days"],
-                    "Employees on Leave": len(data["employees"]),
-                })
-            
-            df = pd.DataFrame(dept_data)
+        if not approved_df.empty:
+            # Requests of unknown employees map to NaN and drop out of the groups
+            departments = approved_df["employee_id"].map(data_manager.get_department_map())
+            dept_summary = approved_df.groupby(departments, sort=False).agg(
+                requests=("id", "size"), days=("days_requested", "sum"), employees=("employee_id", "nunique")
+            )
+            df = pd.DataFrame({
+                "Department": dept_summary.index,
+                "Leave Requests": dept_summary["requests"].values,
+                "Total Days": dept_summary["days"].values,
+                "Employees on Leave": dept_summary["employees"].values,
+            })
             st.dataframe(df, use_container_width=True)
             
             # Bar chart
@@ -2322,14 +3103,27 @@ def render_reports(data_manager: DataManager):
             )
             
             if selected_emp:
-                emp_requests = [r for r in data_manager.leave_requests.values() if r.employee_id == selected_emp.id]
+                emp_requests = data_manager.get_employee_requests(selected_emp.id)
                 current_year = datetime.now().year
+                year_start_ord = date(current_year, 1, 1).toordinal()
+                year_end_ord = date(current_year, 12, 31).toordinal()
                 
-                # Filter requests for this year
-                this_year_requests = [
-                    r for r in emp_requests 
-                    if datetime.strptime(r.start_date, "%Y-%m-%d").year == current_year
-                ]
+                # One pass for the all-time counts and this year's requests
+                status_counts = Counter()
+                total_days = 0
+                this_year_requests = []
+                this_year_approved = []
+                total_days_this_year = 0
+                for r in emp_requests:
+                    status_counts[r.status] += 1
+                    approved = r.status == "Manager_Approved"
+                    if approved:
+                        total_days += r.days_requested
+                    if year_start_ord <= r.start_ord <= year_end_ord:
+                        this_year_requests.append(r)
+                        if approved:
+                            this_year_approved.append(r)
+                            total_days_this_year += r.days_requested
                 
                 # Overall metrics
                 st.markdown(f"### 📊 Overall Statistics (All Time)")
@@ -2337,22 +3131,16 @@ def render_reports(data_manager: DataManager):
                 with col1:
                     st.metric("Total Requests", len(emp_requests))
                 with col2:
-                    approved_count = sum(1 for r in emp_requests if r.status == "Manager_Approved")
-                    st.metric("Approved", approved_count)
+                    st.metric("Approved", status_counts["Manager_Approved"])
                 with col3:
-                    pending_count = sum(1 for r in emp_requests if r.status == "Pending")
-                    st.metric("Pending", pending_count)
+                    st.metric("Pending", status_counts["Pending"])
                 with col4:
-                    total_days = sum(r.days_requested for r in emp_requests if r.status == "Manager_Approved")
                     st.metric("Total Days Taken", total_days)
                 
                 # This Year Summary
                 st.markdown(f"### 📅 This Year ({current_year}) Summary")
                 
                 if this_year_requests:
-                    this_year_approved = [r for r in this_year_requests if r.status == "Manager_Approved"]
-                    total_days_this_year = sum(r.days_requested for r in this_year_approved)
-                    
                     col1, col2, col3 = st.columns(3)
                     with col1:
                         st.metric(f"Requests in {current_year}", len(this_year_requests))
@@ -2364,51 +3152,39 @@ def render_reports(data_manager: DataManager):
                     # Leave breakdown by month
                     st.markdown(f"#### 📆 Monthly Breakdown ({current_year})")
                     
-                    monthly_breakdown = defaultdict(lambda: {"count": 0, "days": 0, "leaves": []})
-                    for req in this_year_approved:
-                        month = datetime.strptime(req.start_date, "%Y-%m-%d").strftime("%B")
-                        monthly_breakdown[month]["count"] += 1
-                        monthly_breakdown[month]["days"] += req.days_requested
-                        monthly_breakdown[month]["leaves"].append({
-                            "type": req.leave_type,
-                            "days": req.days_requested,
-                            "dates": f"{req.start_date} to {req.end_date}"
-                        })
+                    # Group by month number, which keeps calendar order
+                    emp_approved_df = approved_df[approved_df["employee_id"] == selected_emp.id]
+                    year_df = emp_approved_df[emp_approved_df["start_date"].dt.year == current_year]
+                    monthly_breakdown = year_df.groupby(year_df["start_date"].dt.month).agg(
+                        count=("id", "size"),
+                        days=("days_requested", "sum"),
+                        leave_types=("leave_type", lambda types: ", ".join(types.unique())),
+                    )
                     
                     # Display monthly table
-                    month_data = []
-                    month_order = ["January", "February", "March", "April", "May", "June",
-                                  "July", "August", "September", "October", "November", "December"]
-                    
-                    for month in month_order:
-                        if month in monthly_breakdown:
-                            data = monthly_breakdown[month]
-                            leave_types = ", ".join(set(l["type"] for l in data["leaves"]))
-                            month_data.append({
-                                "Month": month,
-                                "Leave Requests": data["count"],
-                                "Total Days": data["days"],
-                                "Leave Types": leave_types
-                            })
-                    
-                    if month_data:
-                        st.dataframe(pd.DataFrame(month_data), use_container_width=True)
+                    if not monthly_breakdown.empty:
+                        month_df = pd.DataFrame({
+                            "Month": [MONTH_NAMES[month - 1] for month in monthly_breakdown.index],
+                            "Leave Requests": monthly_breakdown["count"].values,
+                            "Total Days": monthly_breakdown["days"].values,
+                            "Leave Types": monthly_breakdown["leave_types"].values,
+                        })
+                        st.dataframe(month_df, use_container_width=True)
                         
                         # Monthly bar chart
-                        chart_df = pd.DataFrame(month_data)
-                        st.bar_chart(chart_df.set_index("Month")[["Total Days"]], use_container_width=True)
+                        st.bar_chart(month_df.set_index("Month")[["Total Days"]], use_container_width=True)
                     
                     # Detailed leave list for this year
                     with st.expander(f"📋 View All {current_year} Leave Details"):
-                        for i, req in enumerate(this_year_approved, 1):
-                            month = datetime.strptime(req.start_date, "%Y-%m-%d").strftime("%B")
-                            st.markdown(f"""
-                            <div style="background-color: #1e3a5f; padding: 10px; border-radius: 5px; margin: 5px 0; border-left: 4px solid #4a90d9;">
-                                <strong>#{i} - {req.leave_type}</strong> ({req.days_requested} days)<br>
-                                <span style="color: #aaaaaa;">📅 {req.start_date} to {req.end_date} | Month: {month}</span><br>
-                                <span style="color: #aaaaaa;">💬 {req.reason}</span>
-                            </div>
-                            """, unsafe_allow_html=True)
+                        details_html = [
+                            REPORT_LEAVE_DETAIL_HTML.format(
+                                number=i, leave_type=req.leave_type, days=req.days_requested,
+                                start_date=req.start_date, end_date=req.end_date,
+                                month=MONTH_NAMES[req.start_dt.month - 1], reason=req.reason,
+                            )
+                            for i, req in enumerate(this_year_approved, 1)
+                        ]
+                        st.markdown("".join(details_html), unsafe_allow_html=True)
                 else:
                     st.info(f"ℹ️ No leave taken in {current_year}")
                 
@@ -2416,41 +3192,32 @@ def render_reports(data_manager: DataManager):
                 st.markdown("### 📜 Complete Leave History (All Time)")
                 
                 if emp_requests:
-                    # Add year column for sorting
-                    history_data = []
-                    for req in emp_requests:
-                        req_date = datetime.strptime(req.start_date, "%Y-%m-%d")
-                        history_data.append({
-                            "Leave Type": req.leave_type,
-                            "Year": req_date.year,
-                            "Month": req_date.strftime("%B"),
-                            "From": req.start_date,
-                            "To": req.end_date,
-                            "Days": req.days_requested,
-                            "Status": req.status,
-                        })
-                    
-                    history_df = pd.DataFrame(history_data).sort_values(["Year", "From"], ascending=[False, False])
+                    # Build column-wise, with a year column for sorting
+                    start_dates = [req.start_dt for req in emp_requests]
+                    history_df = pd.DataFrame({
+                        "Leave Type": [req.leave_type for req in emp_requests],
+                        "Year": [d.year for d in start_dates],
+                        "Month": [MONTH_NAMES[d.month - 1] for d in start_dates],
+                        "From": [req.start_date for req in emp_requests],
+                        "To": [req.end_date for req in emp_requests],
+                        "Days": [req.days_requested for req in emp_requests],
+                        "Status": [req.status for req in emp_requests],
+                    }).sort_values(["Year", "From"], ascending=[False, False])
                     st.dataframe(history_df, use_container_width=True)
                     
                     # Leave type breakdown
                     st.markdown("#### 📊 Leave Type Breakdown (All Time)")
-                    type_breakdown = defaultdict(lambda: {"count": 0, "days": 0})
-                    for req in emp_requests:
-                        if req.status == "Manager_Approved":
-                            type_breakdown[req.leave_type]["count"] += 1
-                            type_breakdown[req.leave_type]["days"] += req.days_requested
-                    
-                    type_data = []
-                    for leave_type, data in type_breakdown.items():
-                        type_data.append({
-                            "Leave Type": leave_type,
-                            "Times Taken": data["count"],
-                            "Total Days": data["days"]
-                        })
+                    emp_approved_df = approved_df[approved_df["employee_id"] == selected_emp.id]
+                    type_breakdown = emp_approved_df.groupby("leave_type", sort=False).agg(
+                        count=("id", "size"), days=("days_requested", "sum")
+                    )
                     
-                    if type_data:
-                        st.dataframe(pd.DataFrame(type_data), use_container_width=True)
+                    if not type_breakdown.empty:
+                        st.dataframe(pd.DataFrame({
+                            "Leave Type": type_breakdown.index,
+                            "Times Taken": type_breakdown["count"].values,
+                            "Total Days": type_breakdown["days"].values,
+                        }), use_container_width=True)
                 else:
                     st.info("No leave history for this employee.")
         else:
@@ -2484,109 +3251,112 @@ def render_reports(data_manager: DataManager):
             st.error("❌ Start date must be before end date!")
         else:
             # Filter leave requests that overlap with the selected date range
-            overlapping_leaves = []
+            # Every status is listed here, so mask the shared requests frame rather than
+            # the active-only interval index
+            # Leave overlaps if: leave_start <= range_end AND leave_end >= range_start
+            departments = requests_df["employee_id"].map(data_manager.get_department_map())
+            in_range = (
+                (requests_df["start_date"] <= pd.Timestamp(end_date))
+                & (requests_df["end_date"] >= pd.Timestamp(start_date))
+                & departments.notna()
+            )
+            # Sort by start date (stable, so ties keep submission order)
+            overlapping = requests_df[in_range].sort_values("start_date", kind="stable")
             
-            for req in data_manager.leave_requests.values():
-                # Check if leave overlaps with selected date range
-                # Leave overlaps if: leave_start <= range_end AND leave_end >= range_start
-                leave_starts_before_range_ends = req.start_date <= end_date_str
-                leave_ends_after_range_starts = req.end_date >= start_date_str
-                
-                if leave_starts_before_range_ends and leave_ends_after_range_starts:
-                    emp = data_manager.employees.get(req.employee_id)
-                    if emp:
-                        overlapping_leaves.append({
-                            "Employee ID": req.employee_id,
-                            "Employee Name": req.employee_name,
-                            "Department": emp.department,
-                            "Leave Type": req.leave_type,
-                            "From": req.start_date,
-                            "To": req.end_date,
-                            "Days": req.days_requested,
-                            "Status": req.status
-                        })
+            # Build the table column-wise from the frame
+            df = pd.DataFrame({
+                "Employee ID": overlapping["employee_id"],
+                "Employee Name": overlapping["employee_name"],
+                "Department": departments[overlapping.index],
+                "Leave Type": overlapping["leave_type"],
+                "From": overlapping["start_date"].dt.strftime("%Y-%m-%d"),
+                "To": overlapping["end_date"].dt.strftime("%Y-%m-%d"),
+                "Days": overlapping["days_requested"],
+                "Status": overlapping["status"],
+            }).reset_index(drop=True)
             
             # Display results
-            if overlapping_leaves:
-                # Sort by start date
-                overlapping_leaves.sort(key=lambda x: x["From"])
-                
+            if not df.empty:
                 # Summary metrics
                 st.markdown("### 📊 Summary")
                 col1, col2, col3, col4 = st.columns(4)
                 with col1:
-                    st.metric("Total Employees on Leave", len(set(l["Employee ID"] for l in overlapping_leaves)))
+                    st.metric("Total Employees on Leave", df["Employee ID"].nunique())
                 with col2:
-                    st.metric("Total Leave Records", len(overlapping_leaves))
+                    st.metric("Total Leave Records", len(df))
                 with col3:
-                    total_days = sum(l["Days"] for l in overlapping_leaves)
+                    total_days = int(df["Days"].sum())
                     st.metric("Total Days", total_days)
                 with col4:
-                    unique_depts = len(set(l["Department"] for l in overlapping_leaves))
+                    unique_depts = df["Department"].nunique()
                     st.metric("Departments Affected", unique_depts)
                 
                 # Department breakdown
                 st.markdown("### 📈 Department Breakdown")
-                dept_breakdown = defaultdict(lambda: {"count": 0, "employees": set()})
-                for leave in overlapping_leaves:
-                    dept_breakdown[leave["Department"]]["count"] += 1
-                    dept_breakdown[leave["Department"]]["employees"].add(leave["Employee ID"])
-                
-                dept_data = []
-                for dept, data in sorted(dept_breakdown.items()):
-                    dept_data.append({
-                        "Department": dept,
-                        "Employees on Leave": len(data["employees"]),
-                        "Leave Records": data["count"]
-                    })
-                
-                st.dataframe(pd.DataFrame(dept_data), use_container_width=True)
+                dept_breakdown = df.groupby("Department").agg(
+                    employees=("Employee ID", "nunique"), count=("Employee ID", "size")
+                )
+                st.dataframe(pd.DataFrame({
+                    "Department": dept_breakdown.index,
+                    "Employees on Leave": dept_breakdown["employees"].values,
+                    "Leave Records": dept_breakdown["count"].values,
+                }), use_container_width=True)
                 
                 # Detailed leave table
                 st.markdown("### 📋 Detailed Leave Schedule")
                 
                 # Create a styled dataframe
-                df = pd.DataFrame(overlapping_leaves)
-                
                 # Add a color indicator for status
-                def color_status(val):
-                    if val == "Manager_Approved":
-                        return 'background-color: #2ecc71; color: white'
-                    elif val == "Pending":
-                        return 'background-color: #f39c12; color: white'
-                    elif val == "Admin_Approved":
-                        return 'background-color: #3498db; color: white'
-                    elif val == "Rejected":
-                        return 'background-color: #e74c3c; color: white'
-                    return ''
+                status_styles = {
+                    "Manager_Approved": 'background-color: #2ecc71; color: white',
+                    "Pending": 'background-color: #f39c12; color: white',
+                    "Admin_Approved": 'background-color: #3498db; color: white',
+                    "Rejected": 'background-color: #e74c3c; color: white',
+                }
                 
-                styled_df = df.style.applymap(color_status, subset=['Status'])
+                def color_status(column):
+                    # Whole-column lookup instead of a callback per cell
+                    return column.map(status_styles).fillna('')
+                
+                styled_df = df.style.apply(color_status, subset=['Status'])
                 st.dataframe(styled_df, use_container_width=True)
                 
                 # Timeline view
                 st.markdown("### 📅 Timeline View")
                 
-                # Group by date
+                # Daily counts from a +1/-1 sweep over day offsets (leaves clipped to the range)
                 date_range = pd.date_range(start=start_date, end=end_date, freq='D')
-                timeline_data = []
+                num_days = len(date_range)
+                range_start = np.datetime64(start_date_str)
+                leave_starts = (overlapping["start_date"].values.astype("datetime64[D]") - range_start).astype(np.int64)
+                leave_ends = (overlapping["end_date"].values.astype("datetime64[D]") - range_start).astype(np.int64)
+                leave_starts = np.maximum(leave_starts, 0)
+                leave_ends = np.minimum(leave_ends, num_days - 1) + 1
+                delta = np.zeros(num_days + 1, dtype=np.int64)
+                np.add.at(delta, leave_starts, 1)
+                np.add.at(delta, leave_ends, -1)
+                daily_counts = np.cumsum(delta[:-1])
                 
-                for single_date in date_range:
-                    date_str = single_date.strftime("%Y-%m-%d")
-                    employees_on_leave = []
-                    
-                    for leave in overlapping_leaves:
-                        if leave["From"] <= date_str <= leave["To"]:
-                            employees_on_leave.append(f"{leave['Employee Name']} ({leave['Leave Type']})")
-                    
-                    if employees_on_leave:
-                        timeline_data.append({
-                            "Date": single_date.strftime("%Y-%m-%d (%a)"),
-                            "Employees on Leave": len(employees_on_leave),
-                            "Names": ", ".join(employees_on_leave[:3]) + ("..." if len(employees_on_leave) > 3 else "")
-                        })
+                # Names for busy days only: leaves are sorted by start, so walk them once
+                # keeping the ones still running, in table order
+                labels = (df["Employee Name"] + " (" + df["Leave Type"] + ")").tolist()
+                busy_days = np.flatnonzero(daily_counts)
+                names = []
+                active = []
+                next_leave = 0
+                for day in busy_days:
+                    while next_leave < len(labels) and leave_starts[next_leave] <= day:
+                        active.append(next_leave)
+                        next_leave += 1
+                    active = [i for i in active if leave_ends[i] > day]
+                    names.append(", ".join(labels[i] for i in active[:3]) + ("..." if len(active) > 3 else ""))
                 
-                if timeline_data:
-                    timeline_df = pd.DataFrame(timeline_data)
+                if names:
+                    timeline_df = pd.DataFrame({
+                        "Date": date_range[busy_days].strftime("%Y-%m-%d (%a)"),
+                        "Employees on Leave": daily_counts[busy_days],
+                        "Names": names,
+                    })
                     st.dataframe(timeline_df, use_container_width=True)
                     
                     # Chart showing daily count
@@ -2597,7 +3367,7 @@ def render_reports(data_manager: DataManager):
                 
                 # Export option
                 st.markdown("### 📥 Export")
-                csv = df.to_csv(index=False)
+                csv = get_leave_report_csv_cached(df, data_manager.version, start_date, end_date)
                 st.download_button(
                     label="Download Report as CSV",
                     data=csv,
@@ -2646,21 +3416,24 @@ def render_user_management(data_manager: DataManager):
                 role = st.selectbox(
                     "User Role",
                     options=list(USER_ROLES.keys()),
-                    format_func=lambda x: USER_ROLES[x]
+                    format_func=USER_ROLES.__getitem__
                 )
                 
                 # Employee selection
-                available_employees = [
-                    e for e in data_manager.employees.values()
-                    if e.id not in [u.employee_id for u in data_manager.users.values()]
-                ]
+                assigned_ids = {u.employee_id for u in data_manager.users.values()}
+                available_employees = {
+                    e.id: f"{e.name} ({e.id} - {e.department})"
+                    for e in data_manager.employees.values()
+                    if e.id not in assigned_ids
+                }
                 
                 if available_employees:
-                    employee = st.selectbox(
+                    employee_id = st.selectbox(
                         "Link to Employee",
-                        options=available_employees,
-                        format_func=lambda x: f"{x.name} ({x.id} - {x.department})"
+                        options=list(available_employees),
+                        format_func=available_employees.__getitem__
                     )
+                    employee = data_manager.employees.get(employee_id)
                 else:
                     st.warning("All employees already have user accounts.")
                     employee = None
@@ -2692,8 +3465,7 @@ def render_user_management(data_manager: DataManager):
                     st.error("Username already exists.")
                     return
                 
-                auth = AuthManager()
-                is_valid, msg = auth.validate_username(username)
+                is_valid, msg = AuthManager.validate_username(username)
                 if not is_valid:
                     st.error(msg)
                     return
@@ -2704,7 +3476,7 @@ def render_user_management(data_manager: DataManager):
                 
                 # Generate or use custom password
                 if password_option == "Generate Temporary Password":
-                    password = auth.generate_temporary_password()
+                    password = AuthManager.generate_temporary_password()
                 else:
                     password = custom_password
                     if len(password) < 6:
@@ -2712,7 +3484,7 @@ def render_user_management(data_manager: DataManager):
                         return
                 
                 # Create user
-                password_hash, salt = auth.hash_password(password)
+                password_hash, salt = AuthManager.hash_password(password)
                 new_user = User(
                     username=username,
                     password_hash=password_hash,
@@ -2743,11 +3515,13 @@ def render_user_management(data_manager: DataManager):
         st.subheader("Reset User Password")
         
         if data_manager.users:
-            user_to_reset = st.selectbox(
+            user_labels = {u.username: f"{u.username} ({u.role})" for u in data_manager.users.values()}
+            reset_username = st.selectbox(
                 "Select User",
-                options=list(data_manager.users.values()),
-                format_func=lambda x: f"{x.username} ({x.role})"
+                options=list(user_labels),
+                format_func=user_labels.__getitem__
             )
+            user_to_reset = data_manager.users.get(reset_username)
             
             if user_to_reset:
                 new_password = st.text_input(
@@ -2761,8 +3535,7 @@ def render_user_management(data_manager: DataManager):
                         st.error("Password must be at least 6 characters.")
                         return
                     
-                    auth = AuthManager()
-                    password_hash, salt = auth.hash_password(new_password)
+                    password_hash, salt = AuthManager.hash_password(new_password)
                     
                     data_manager.update_user(
                         user_to_reset.username,
@@ -2814,26 +3587,21 @@ def render_user_management(data_manager: DataManager):
                     st.error("User not found.")
                     return
                 
-                auth = AuthManager()
-                if not auth.verify_password(current_password, user.password_hash, user.salt):
+                if not AuthManager.verify_password(current_password, user.password_hash, user.salt):
                     st.error("❌ Current password is incorrect.")
                     return
                 
-                # Validate new password
-                if len(new_password) < 8:
-                    st.error("New password must be at least 8 characters long.")
-                    return
-                
-                if new_password != confirm_password:
-                    st.error("❌ New passwords do not match.")
-                    return
-                
-                if current_password == new_password:
-                    st.error("❌ New password must be different from current password.")
+                # Validate new password, reporting every problem at once
+                password_errors = []
+                if len(new_password) < PASSWORD_MIN_LENGTH:
+                    password_errors.append(f"New password must be at least {PASSWORD_MIN_LENGTH} characters long.")
+                password_errors += new_password_mismatch_errors(current_password, new_password, confirm_password)
+                if password_errors:
+                    st.error(format_error_list(password_errors))
                     return
                 
                 # Update password
-                password_hash, salt = auth.hash_password(new_password)
+                password_hash, salt = AuthManager.hash_password(new_password)
                 data_manager.update_user(
                     current_user,
                     password_hash=password_hash,
@@ -2844,6 +3612,31 @@ def render_user_management(data_manager: DataManager):
                 st.info("🔒 Your password has been updated. Please use the new password for your next login.")
 
 
+# Request card on the employee dashboard, filled per request with str.format
+EMPLOYEE_REQUEST_CARD_HTML = """
+                <div style="background-color: #1e3a5f; padding: 15px; border-radius: 8px; 
+                            border-left: 4px solid {color}; margin: 10px 0;">
+                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                        <div>
+                            <span style="font-size: 20px;">{icon}</span>
+                            <strong style="color: #ffffff; font-size: 16px;">{leave_type}</strong>
+                            <span style="color: {color}; font-size: 12px;">({status})</span>
+                        </div>
+                        <div style="color: #aaaaaa; font-size: 12px;">
+                            Submitted: {submitted_date}
+                        </div>
+                    </div>
+                    <div style="color: #e0e0e0; margin-top: 8px;">
+                        📅 {start_date} to {end_date} ({days} days)<br>
+                        💬 {reason}
+                    </div>
+                    <div style="color: #aaaaaa; font-size: 12px; margin-top: 5px;">
+                        {desc}
+                    </div>
+                </div>
+                """
+
+
 def render_employee_dashboard(data_manager: DataManager, calculator: LeaveCalculator):
     """Render employee-specific dashboard"""
     emp_id = st.session_state.employee_id
@@ -2858,11 +3651,16 @@ def render_employee_dashboard(data_manager: DataManager, calculator: LeaveCalcul
     # Employee stats
     col1, col2, col3, col4 = st.columns(4)
     
-    my_requests = [r for r in data_manager.leave_requests.values() if r.employee_id == emp_id]
-    pending = sum(1 for r in my_requests if r.status == "Pending")
-    admin_approved = sum(1 for r in my_requests if r.status == "Admin_Approved")
-    final_approved = sum(1 for r in my_requests if r.status == "Manager_Approved")
-    total_taken = sum(r.days_requested for r in my_requests if r.status == "Manager_Approved")
+    my_requests = data_manager.get_employee_requests(emp_id)
+    # Tally statuses and approved days in one pass over the employee's bucket
+    status_counts = Counter()
+    total_taken = 0
+    for r in my_requests:
+        status_counts[r.status] += 1
+        if r.status == "Manager_Approved":
+            total_taken += r.days_requested
+    pending = status_counts["Pending"]
+    final_approved = status_counts["Manager_Approved"]
     
     with col1:
         st.metric("Leave Balance", f"{employee.annual_leave_balance} days")
@@ -2889,49 +3687,30 @@ def render_employee_dashboard(data_manager: DataManager, calculator: LeaveCalcul
     st.subheader("📋 My Leave Requests")
     
     if my_requests:
-        my_requests_sorted = sorted(my_requests, key=lambda x: x.submitted_date, reverse=True)
+        my_requests_sorted = sorted(my_requests, key=attrgetter("submitted_date"), reverse=True)
         
+        # Cards are batched into one markdown element per run; each pending card
+        # flushes the batch so its Cancel button still sits right below it
+        cards_html = []
         for req in my_requests_sorted:
             # Status color and icon
-            status_config = {
-                "Pending": ("⏳", "#FF9800", "Awaiting Admin/HR Review"),
-                "Admin_Approved": ("✅", "#4CAF50", "Approved by Admin - Awaiting Manager"),
-                "Manager_Approved": ("🎉", "#2196F3", "Fully Approved"),
-                "Rejected": ("❌", "#F44336", "Rejected"),
-                "Cancelled": ("🚫", "#9E9E9E", "Cancelled"),
-            }
-            icon, color, desc = status_config.get(req.status, ("❓", "#999999", "Unknown"))
+            icon, color, desc = STATUS_CONFIG.get(req.status, UNKNOWN_STATUS_CONFIG)
+            cards_html.append(EMPLOYEE_REQUEST_CARD_HTML.format(
+                icon=icon, color=color, desc=desc, leave_type=req.leave_type, status=req.status,
+                submitted_date=req.submitted_date, start_date=req.start_date, end_date=req.end_date,
+                days=req.days_requested, reason=req.reason,
+            ))
             
-            with st.container():
-                st.markdown(f"""
-                <div style="background-color: #1e3a5f; padding: 15px; border-radius: 8px; 
-                            border-left: 4px solid {color}; margin: 10px 0;">
-                    <div style="display: flex; justify-content: space-between; align-items: center;">
-                        <div>
-                            <span style="font-size: 20px;">{icon}</span>
-                            <strong style="color: #ffffff; font-size: 16px;">{req.leave_type}</strong>
-                            <span style="color: {color}; font-size: 12px;">({req.status})</span>
-                        </div>
-                        <div style="color: #aaaaaa; font-size: 12px;">
-                            Submitted: {req.submitted_date}
-                        </div>
-                    </div>
-                    <div style="color: #e0e0e0; margin-top: 8px;">
-                        📅 {req.start_date} to {req.end_date} ({req.days_requested} days)<br>
-                        💬 {req.reason}
-                    </div>
-                    <div style="color: #aaaaaa; font-size: 12px; margin-top: 5px;">
-                        {desc}
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Cancel button for pending requests
-                if req.status == "Pending":
-                    if st.button("Cancel Request", key=f"cancel_{req.id}"):
-                        data_manager.update_leave_request(req.id, status="Cancelled")
-                        st.success("Request cancelled.")
-                        st.rerun()
+            # Cancel button for pending requests
+            if req.status == "Pending":
+                st.markdown("".join(cards_html), unsafe_allow_html=True)
+                cards_html.clear()
+                if st.button("Cancel Request", key=f"cancel_{req.id}"):
+                    data_manager.update_leave_request(req.id, status="Cancelled")
+                    st.success("Request cancelled.")
+                    st.rerun()
+        if cards_html:
+            st.markdown("".join(cards_html), unsafe_allow_html=True)
     else:
         st.info("You haven't submitted any leave requests yet.")
     
@@ -2956,22 +3735,12 @@ def render_employee_leave_request(data_manager: DataManager, calculator: LeaveCa
         with col1:
             leave_type = st.selectbox(
                 "Leave Type",
-                options=list(LEAVE_TYPES.keys()),
-                format_func=lambda x: f"{x} - {LEAVE_TYPES[x]['description']}"
+                options=LEAVE_TYPE_NAMES,
+                format_func=LEAVE_TYPE_LABELS.__getitem__
             )
             
             # Show detailed UAE law information
-            leave_info = LEAVE_TYPES[leave_type]
-            st.markdown(f"""
-            <div style="background-color: #1e3a5f; padding: 15px; border-radius: 8px; border: 1px solid #4a90d9; margin: 10px 0;">
-                <h4 style="color: #ffffff; margin: 0 0 10px 0;">📋 {leave_type}</h4>
-                <table style="width: 100%; color: #e0e0e0; font-size: 13px;">
-                    <tr><td style="padding: 4px;"><strong>📊 Entitlement:</strong></td><td>{leave_info['entitlement']}</td></tr>
-                    <tr><td style="padding: 4px;"><strong>💰 Payment:</strong></td><td>{leave_info['payment']}</td></tr>
-                    <tr><td style="padding: 4px;"><strong>📋 Requirements:</strong></td><td>{leave_info['requirements']}</td></tr>
-                </table>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(LEAVE_SUMMARY_CARDS[leave_type], unsafe_allow_html=True)
             
             col_date1, col_date2 = st.columns(2)
             with col_date1:
@@ -2982,19 +3751,19 @@ def render_employee_leave_request(data_manager: DataManager, calculator: LeaveCa
         with col2:
             # Calculate days
             calendar_days = calculator.calculate_calendar_days(
-                start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d")
+                start_date,
+                end_date
             )
             working_days = calculator.calculate_working_days(
-                start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d")
+                start_date,
+                end_date
             )
             
             st.metric("Calendar Days", calendar_days)
             st.metric("Working Days", working_days)
             
             # Days to request based on leave type
-            if leave_type in ["Parental Leave", "Study Leave"]:
+            if leave_type in WORKING_DAY_LEAVE_TYPES:
                 days_requested = working_days
             else:
                 days_requested = calendar_days
@@ -3008,12 +3777,26 @@ def render_employee_leave_request(data_manager: DataManager, calculator: LeaveCa
             
             reason = st.text_area("Reason for Leave", placeholder="Please provide details...")
         
+        # Check the employee's own leave first - overlapping it is not allowed
+        own_overlaps = calculator.find_own_overlaps(
+            data_manager,
+            employee.id,
+            start_date,
+            end_date
+        )
+        
+        if own_overlaps:
+            st.error("❌ You already have leave during this period: " + ", ".join(
+                f"{r.leave_type} {r.start_date} to {r.end_date} ({r.status.replace('_', ' ')})"
+                for r in own_overlaps
+            ))
+        
         # Check for conflicts
         has_conflict, conflict_message, conflict_details = calculator.check_conflicts(
             data_manager,
             employee.id,
-            start_date.strftime("%Y-%m-%d"),
-            end_date.strftime("%Y-%m-%d")
+            start_date,
+            end_date
         )
         
         if conflict_message:
@@ -3029,6 +3812,10 @@ def render_employee_leave_request(data_manager: DataManager, calculator: LeaveCa
                 st.error("Please provide a reason for the leave.")
                 return
             
+            if own_overlaps:
+                st.error("Cannot submit: These dates overlap your existing leave.")
+                return
+            
             if leave_type == "Annual Leave" and employee.annual_leave_balance < days_requested:
                 st.error("Cannot submit: Insufficient leave balance.")
                 return
@@ -3061,14 +3848,16 @@ def render_employee_history(data_manager: DataManager, employee: Employee):
     """Render employee's leave history"""
     st.subheader("📊 My Leave History")
     
-    emp_requests = [r for r in data_manager.leave_requests.values() if r.employee_id == employee.id]
+    emp_requests = data_manager.get_employee_requests(employee.id)
     current_year = datetime.now().year
     
-    # This year summary
+    # This year summary (compare cached day ordinals against the year's bounds)
+    year_start = date(current_year, 1, 1).toordinal()
+    next_year_start = date(current_year + 1, 1, 1).toordinal()
     this_year_requests = [
-        r for r in emp_requests 
-        if datetime.strptime(r.start_date, "%Y-%m-%d").year == current_year
-        and r.status == "Manager_Approved"
+        r for r in emp_requests
+        if r.status == "Manager_Approved"
+        and year_start <= r.start_ord < next_year_start
     ]
     
     total_days_this_year = sum(r.days_requested for r in this_year_requests)
@@ -3082,26 +3871,27 @@ def render_employee_history(data_manager: DataManager, employee: Employee):
     if this_year_requests:
         st.write(f"**Leave taken this year ({current_year}):**")
         for req in this_year_requests:
-            month = datetime.strptime(req.start_date, "%Y-%m-%d").strftime("%B")
+            month = MONTH_NAMES[req.start_dt.month - 1]
             st.write(f"- {req.leave_type}: {req.start_date} to {req.end_date} ({req.days_requested} days) - {month}")
     
     # Complete history table
     st.markdown("---")
     if emp_requests:
-        history_data = []
-        for req in emp_requests:
-            req_date = datetime.strptime(req.start_date, "%Y-%m-%d")
-            history_data.append({
-                "Leave Type": req.leave_type,
-                "Year": req_date.year,
-                "Month": req_date.strftime("%B"),
-                "From": req.start_date,
-                "To": req.end_date,
-                "Days": req.days_requested,
-                "Status": req.status,
-            })
-        
-        history_df = pd.DataFrame(history_data).sort_values(["Year", "From"], ascending=[False, False])
+        # Newest first: the ISO start date orders by year then date, so a stable
+        # reverse list sort replaces sort_values; the index keeps submission positions
+        order = sorted(range(len(emp_requests)), key=lambda i: emp_requests[i].start_date, reverse=True)
+        history = [emp_requests[i] for i in order]
+        # Build the table column by column (no per-row dicts, no Styler)
+        start_dates = [req.start_dt for req in history]
+        history_df = pd.DataFrame({
+            "Leave Type": [req.leave_type for req in history],
+            "Year": np.fromiter((d.year for d in start_dates), dtype=np.int64, count=len(start_dates)),
+            "Month": [MONTH_NAMES[d.month - 1] for d in start_dates],
+            "From": [req.start_date for req in history],
+            "To": [req.end_date for req in history],
+            "Days": [req.days_requested for req in history],
+            "Status": [req.status for req in history],
+        }, index=order)
         st.dataframe(history_df, use_container_width=True)
     else:
         st.info("No leave history found.")
@@ -3120,22 +3910,22 @@ def render_two_level_approvals(data_manager: DataManager):
         
         with tab1:
             st.subheader("Leave Requests Awaiting Your Review (Level 1)")
-            pending_requests = [r for r in data_manager.leave_requests.values() if r.status == "Pending"]
+            pending_requests = data_manager.get_requests_by_status("Pending")
             render_approval_list(data_manager, pending_requests, "admin")
         
         with tab2:
             st.subheader("Approved by You (Awaiting Manager)")
-            admin_approved = [r for r in data_manager.leave_requests.values() if r.status == "Admin_Approved"]
+            admin_approved = data_manager.get_requests_by_status("Admin_Approved")
             render_approval_list(data_manager, admin_approved, "view_only")
         
         with tab3:
             st.subheader("Fully Approved (Manager Finalized)")
-            fully_approved = [r for r in data_manager.leave_requests.values() if r.status == "Manager_Approved"]
+            fully_approved = data_manager.get_requests_by_status("Manager_Approved")
             render_approval_list(data_manager, fully_approved, "view_only")
         
         with tab4:
             st.subheader("Rejected Requests")
-            rejected = [r for r in data_manager.leave_requests.values() if r.status == "Rejected"]
+            rejected = data_manager.get_requests_by_status("Rejected")
             render_approval_list(data_manager, rejected, "view_only")
     
     elif user_role == "manager":
@@ -3144,22 +3934,24 @@ def render_two_level_approvals(data_manager: DataManager):
         with tab1:
             st.subheader("Leave Requests Awaiting Final Approval (Level 2)")
             # Show requests that are admin approved (or pending if admin hasn't acted)
-            awaiting_final = [r for r in data_manager.leave_requests.values() if r.status in ["Admin_Approved", "Pending"]]
+            awaiting_final = data_manager.get_requests_by_status("Admin_Approved", "Pending")
             render_approval_list(data_manager, awaiting_final, "manager")
         
         with tab2:
             st.subheader("Fully Approved by You")
-            fully_approved = [r for r in data_manager.leave_requests.values() if r.status == "Manager_Approved"]
+            fully_approved = data_manager.get_requests_by_status("Manager_Approved")
             render_approval_list(data_manager, fully_approved, "view_only")
         
         with tab3:
             st.subheader("Admin Approved (Waiting for Your Approval)")
-            admin_approved = [r for r in data_manager.leave_requests.values() if r.status == "Admin_Approved"]
-            render_approval_list(data_manager, admin_approved, "manager")
+            # Same requests as the first tab, which carries their action widgets
+            # (rendering them twice would register duplicate widget keys)
+            admin_approved = data_manager.get_requests_by_status("Admin_Approved")
+            render_approval_list(data_manager, admin_approved, "view_only")
         
         with tab4:
             st.subheader("Rejected Requests")
-            rejected = [r for r in data_manager.leave_requests.values() if r.status == "Rejected"]
+            rejected = data_manager.get_requests_by_status("Rejected")
             render_approval_list(data_manager, rejected, "view_only")
 
 
@@ -3169,11 +3961,15 @@ def render_approval_list(data_manager: DataManager, requests: List[LeaveRequest]
         st.info("No requests to display.")
         return
     
+    if action_role != "view_only":
+        render_approval_form(data_manager, requests, action_role)
+        return
+    
     for req in requests:
         emp = data_manager.employees.get(req.employee_id)
         
         with st.container():
-            col1, col2, col3 = st.columns([3, 2, 1])
+            col1, col2 = st.columns([3, 3])
             
             with col1:
                 st.markdown(f"**{req.employee_name}** ({emp.department if emp else 'N/A'})")
@@ -3194,78 +3990,162 @@ def render_approval_list(data_manager: DataManager, requests: List[LeaveRequest]
                 st.write(f"Current Balance: {emp.annual_leave_balance if emp else 'N/A'} days")
                 
                 # Show status
-                status_badge = {
-                    "Pending": "🟡 Pending",
-                    "Admin_Approved": "🟢 Admin Approved",
-                    "Manager_Approved": "🔵 Fully Approved",
-                    "Rejected": "🔴 Rejected",
-                    "Cancelled": "⚪ Cancelled"
-                }.get(req.status, req.status)
+                status_badge = STATUS_BADGES.get(req.status, req.status)
                 st.write(f"Status: {status_badge}")
             
-            with col3:
-                if action_role == "admin" and req.status == "Pending":
-                    remarks = st.text_input("Remarks", key=f"remarks_{req.id}", placeholder="Optional")
-                    
-                    if st.button("✅ Approve", key=f"approve_{req.id}"):
-                        # Update leave balance for annual leave
-                        if req.leave_type == "Annual Leave" and emp:
-                            new_balance = emp.annual_leave_balance - req.days_requested
-                            data_manager.update_employee(req.employee_id, annual_leave_balance=new_balance)
-                        
-                        data_manager.update_leave_request(
-                            req.id,
-                            status="Admin_Approved",
-                            admin_approved_by=st.session_state.current_user,
-                            admin_approval_date=datetime.now().strftime("%Y-%m-%d"),
-                            admin_remarks=remarks
-                        )
-                        st.success("Approved at Level 1!")
-                        st.rerun()
-                    
-                    if st.button("❌ Reject", key=f"reject_{req.id}"):
-                        data_manager.update_leave_request(
-                            req.id,
-                            status="Rejected",
-                            admin_remarks=remarks
-                        )
-                        st.error("Rejected!")
-                        st.rerun()
-                
-                elif action_role == "manager" and req.status in ["Admin_Approved", "Pending"]:
-                    remarks = st.text_input("Final Remarks", key=f"mgr_remarks_{req.id}", placeholder="Optional")
-                    
-                    if req.status == "Pending":
-                        st.warning("⚠️ Admin hasn't reviewed yet. You can approve directly as final authority.")
-                    
-                    if st.button("✅ Final Approve", key=f"final_approve_{req.id}"):
-                        # Deduct balance if not already done by admin
-                        if req.leave_type == "Annual Leave" and emp and not req.admin_approved_by:
-                            new_balance = emp.annual_leave_balance - req.days_requested
-                            data_manager.update_employee(req.employee_id, annual_leave_balance=new_balance)
-                        
-                        data_manager.update_leave_request(
-                            req.id,
-                            status="Manager_Approved",
-                            manager_approved_by=st.session_state.current_user,
-                            manager_approval_date=datetime.now().strftime("%Y-%m-%d"),
-                            manager_remarks=remarks
-                        )
-                        st.success("Fully Approved!")
-                        st.rerun()
-                    
-                    if st.button("❌ Reject", key=f"mgr_reject_{req.id}"):
-                        data_manager.update_leave_request(
-                            req.id,
-                            status="Rejected",
-                            manager_remarks=remarks
-                        )
-                        st.error("Rejected!")
-                        st.rerun()
-            
             st.divider()
 
 
+def render_approval_form(data_manager: DataManager, requests: List[LeaveRequest], action_role: str):
+    """
+    Render actionable requests as one editable table inside a form: each row gets an
+    Action and Remarks cell, and all chosen decisions are applied on a single submit.
+    """
+    departments = data_manager.get_department_map()
+    balances = {}
+    conflicts = []
+    for req in requests:
+        emp = data_manager.employees.get(req.employee_id)
+        balances[req.id] = emp.annual_leave_balance if emp else None
+        if req.conflict_warning:
+            conflicts.append(f"⚠️ {req.conflict_details}")
+        elif LeaveCalculator.has_conflict(
+            data_manager, req.employee_id, req.start_date, req.end_date, exclude_request_id=req.id
+        ):
+            # Other leave was booked after this request was submitted
+            conflicts.append("⚠️ 2 or more other employees now have overlapping leave dates.")
+        else:
+            conflicts.append("")
+    
+    table = pd.DataFrame({
+        "Request": [req.id for req in requests],
+        "Employee": [req.employee_name for req in requests],
+        "Department": [departments.get(req.employee_id, "N/A") for req in requests],
+        "Leave Type": [req.leave_type for req in requests],
+        "From": [req.start_date for req in requests],
+        "To": [req.end_date for req in requests],
+        "Days": [req.days_requested for req in requests],
+        "Balance": [balances[req.id] for req in requests],
+        "Submitted": [req.submitted_date for req in requests],
+        "Status": [STATUS_BADGES.get(req.status, req.status) for req in requests],
+        "Admin Approval": [
+            f"{req.admin_approved_by} on {req.admin_approval_date}" if req.admin_approved_by else ""
+            for req in requests
+        ],
+        "Conflict": conflicts,
+        "Reason": [req.reason for req in requests],
+        "Action": APPROVAL_NO_ACTION,
+        "Remarks": "",
+    })
+    
+    if action_role == "manager" and any(req.status == "Pending" for req in requests):
+        st.warning("⚠️ Requests still 🟡 Pending haven't been reviewed by Admin/HR. You can approve them directly as final authority.")
+    
+    # Editor edits are stored by row position, so key the editor on the listed
+    # request ids: once the list changes it starts fresh instead of applying
+    # old choices to whichever request now sits in that row
+    rows_digest = hashlib.blake2b("\n".join(table["Request"]).encode(), digest_size=8).hexdigest()
+    
+    remarks_label = "Final Remarks" if action_role == "manager" else "Remarks"
+    with st.form(f"approval_form_{action_role}"):
+        edited = st.data_editor(
+            table,
+            key=f"approval_editor_{action_role}_{rows_digest}",
+            hide_index=True,
+            use_container_width=True,
+            disabled=[column for column in table.columns if column not in ("Action", "Remarks")],
+            column_config={
+                "Action": st.column_config.SelectboxColumn(
+                    "Action", options=APPROVAL_ACTIONS[action_role], required=True
+                ),
+                "Remarks": st.column_config.TextColumn(remarks_label, help="Optional"),
+            },
+        )
+        submitted = st.form_submit_button("Submit Decisions", type="primary")
+    
+    if submitted:
+        decided = edited[edited["Action"] != APPROVAL_NO_ACTION]
+        if decided.empty:
+            st.info("Choose an action for at least one request.")
+            return
+        
+        applied = 0
+        for request_id, action, remarks in zip(decided["Request"], decided["Action"], decided["Remarks"]):
+            req = data_manager.leave_requests.get(request_id)
+            if req and apply_approval_action(data_manager, req, action_role, action, remarks or ""):
+                applied += 1
+        st.success(f"Recorded {applied} decision(s).")
+        st.rerun()
+
+
+def apply_approval_action(data_manager: DataManager, req: LeaveRequest, action_role: str, action: str, remarks: str) -> bool:
+    """Apply one approve/reject decision; returns False if the request is no longer actionable"""
+    emp = data_manager.employees.get(req.employee_id)
+    
+    if action_role == "admin" and req.status == "Pending":
+        if action == "Approve":
+            # Update leave balance for annual leave
+            if req.leave_type == "Annual Leave" and emp:
+                new_balance = emp.annual_leave_balance - req.days_requested
+                data_manager.update_employee(req.employee_id, annual_leave_balance=new_balance)
+            
+            data_manager.update_leave_request(
+                req.id,
+                status="Admin_Approved",
+                admin_approved_by=st.session_state.current_user,
+                admin_approval_date=datetime.now().strftime("%Y-%m-%d"),
+                admin_remarks=remarks
+            )
+        else:
+            data_manager.update_leave_request(
+                req.id,
+                status="Rejected",
+                admin_remarks=remarks
+            )
+        return True
+    
+    if action_role == "manager" and req.status in AWAITING_FINAL_STATUSES:
+        if action == "Final Approve":
+            # Deduct balance if not already done by admin
+            if req.leave_type == "Annual Leave" and emp and not req.admin_approved_by:
+                new_balance = emp.annual_leave_balance - req.days_requested
+                data_manager.update_employee(req.employee_id, annual_leave_balance=new_balance)
+            
+            data_manager.update_leave_request(
+                req.id,
+                status="Manager_Approved",
+                manager_approved_by=st.session_state.current_user,
+                manager_approval_date=datetime.now().strftime("%Y-%m-%d"),
+                manager_remarks=remarks
+            )
+        else:
+            data_manager.update_leave_request(
+                req.id,
+                status="Rejected",
+                manager_remarks=remarks
+            )
+        return True
+    
+    return False
+
+
+def new_password_mismatch_errors(current_password: str, new_password: str, confirm_password: str) -> List[str]:
+    """Confirmation and reuse checks shared by the change-password forms"""
+    errors = []
+    if new_password != confirm_password:
+        errors.append("New passwords do not match.")
+    if current_password == new_password:
+        errors.append("New password must be different from current password.")
+    return errors
+
+
+def format_error_list(errors: List[str]) -> str:
+    """One st.error body for several validation messages (a single one is shown as is)"""
+    if len(errors) == 1:
+        return f"❌ {errors[0]}"
+    return "❌ Please fix the following:\n" + "\n".join(f"- {error}" for error in errors)
+
+
 def render_change_password(data_manager: DataManager):
     """Render change password page for current user"""
     st.header("🔐 Change Password")
@@ -3308,6 +4188,7 @@ def render_change_password(data_manager: DataManager):
             <li>Include uppercase and lowercase letters</li>
             <li>Include at least one number</li>
             <li>Include at least one special character (!@#$%^&*)</li>
+            <li>No character repeated three times in a row</li>
         </ul>
         </div>
         """, unsafe_allow_html=True)
@@ -3325,42 +4206,19 @@ def render_change_password(data_manager: DataManager):
                 st.error("❌ User not found.")
                 return
             
-            auth = AuthManager()
-            if not auth.verify_password(current_password, user.password_hash, user.salt):
+            if not AuthManager.verify_password(current_password, user.password_hash, user.salt):
                 st.error("❌ Current password is incorrect.")
                 return
             
-            # Validate new password strength
-            if len(new_password) < 8:
-                st.error("❌ New password must be at least 8 characters long.")
-                return
-            
-            if not any(c.isupper() for c in new_password):
-                st.error("❌ Password must include at least one uppercase letter.")
-                return
-            
-            if not any(c.islower() for c in new_password):
-                st.error("❌ Password must include at least one lowercase letter.")
-                return
-            
-            if not any(c.isdigit() for c in new_password):
-                st.error("❌ Password must include at least one number.")
-                return
-            
-            if not any(c in '!@#$%^&*' for c in new_password):
-                st.error("❌ Password must include at least one special character (!@#$%^&*).")
-                return
-            
-            if new_password != confirm_password:
-                st.error("❌ New passwords do not match.")
-                return
-            
-            if current_password == new_password:
-                st.error("❌ New password must be different from current password.")
+            # Validate new password strength, reporting every problem at once
+            password_errors = AuthManager.password_policy_errors(new_password)
+            password_errors += new_password_mismatch_errors(current_password, new_password, confirm_password)
+            if password_errors:
+                st.error(format_error_list(password_errors))
                 return
             
             # Update password
-            password_hash, salt = auth.hash_password(new_password)
+            password_hash, salt = AuthManager.hash_password(new_password)
             data_manager.update_user(
                 current_user,
                 password_hash=password_hash,
@@ -3372,31 +4230,8 @@ def render_change_password(data_manager: DataManager):
             st.info("🔒 Your password has been updated. Please use the new password for your next login.")
 
 
-def render_settings(data_manager: DataManager):
-    """Render settings page with app reset functionality (Admin only)"""
-    st.header("⚙️ Settings")
-    
-    # Show current data stats
-    st.subheader("📊 Current Data Overview")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-        st.metric("Total Employees", len(data_manager.employees))
-    with col2:
-        st.metric("Total Users", len(data_manager.users))
-    with col3:
-        st.metric("Leave Requests", len(data_manager.leave_requests))
-    with col4:
-        active_requests = sum(1 for r in data_manager.leave_requests.values() if r.status == "Pending")
-        st.metric("Pending Requests", active_requests)
-    
-    st.markdown("---")
-    
-    # Danger Zone - Reset Application
-    st.subheader("🚨 Danger Zone")
-    
-    with st.container():
-        st.markdown("""
+# Static HTML for the Settings page (Danger Zone panel, reset confirmation)
+DANGER_ZONE_HTML = """
         <div style="background-color: #5c1a1a; padding: 20px; border-radius: 10px; border: 2px solid #ff4444;">
             <h3 style="color: #ff4444; margin-top: 0;">⚠️ Reset Application</h3>
             <p style="color: #ffffff;">
@@ -3415,66 +4250,8 @@ def render_settings(data_manager: DataManager):
                 This action cannot be undone!
             </p>
         </div>
-        """, unsafe_allow_html=True)
-        
-        st.markdown("<br>", unsafe_allow_html=True)
-        
-        # Step 1: Show confirmation checkbox
-        confirm_reset = st.checkbox("I understand this will delete all data permanently", key="confirm_reset")
-        
-        if confirm_reset:
-            # Step 2: Type confirmation code
-            st.warning("Please type **DELETE ALL** to confirm:")
-            confirmation_code = st.text_input("Confirmation Code", placeholder="Type DELETE ALL here", key="reset_code")
-            
-            if confirmation_code == "DELETE ALL":
-                # Step 3: Final confirmation button
-                st.error("🔴 FINAL WARNING: This action is irreversible!")
-                
-                col1, col2 = st.columns([1, 3])
-                with col1:
-                    if st.button("🗑️ RESET APP", type="primary", use_container_width=True):
-                        try:
-                            # Store current admin username before reset
-                            current_admin = st.session_state.current_user
-                            
-                            # Clear all data
-                            data_manager.employees = {}
-                            data_manager.users = {}
-                            data_manager.leave_requests = {}
-                            
-                            # Delete data files
-                            for file_path in [EMPLOYEES_FILE, USERS_FILE, DATA_FILE]:
-                                if os.path.exists(file_path):
-                                    try:
-                                        os.remove(file_path)
-                                    except:
-                                        pass
-                            
-                            # Recreate fresh default data
-                            data_manager._create_sample_employees()
-                            data_manager._create_default_users()
-                            
-                            # Update admin password to default (admin123)
-                            auth = AuthManager()
-                            default_admin_hash, default_admin_salt = auth.hash_password("admin123")
-                            data_manager.update_user(
-                                "admin",
-                                password_hash=default_admin_hash,
-                                salt=default_admin_salt
-                            )
-                            
-                            # Keep admin logged in
-                            st.session_state.current_user = "admin"
-                            st.session_state.user_role = "admin"
-                            st.session_state.employee_id = "EMP004"  # Admin's employee ID
-                            st.session_state.authenticated = True
-                            
-                            # Success message
-                            st.success("✅ Application has been reset successfully!")
-                            st.balloons()
-                            
-                            st.markdown("""
+        """
+RESET_COMPLETE_HTML = """
                             <div style="background-color: #1a5c1a; padding: 20px; border-radius: 10px; margin: 20px 0;">
                                 <h4 style="color: #ffffff; margin-top: 0;">🔄 Reset Complete</h4>
                                 <p style="color: #ffffff;">
@@ -3486,20 +4263,135 @@ def render_settings(data_manager: DataManager):
                                     Password: <code>admin123</code>
                                 </p>
                             </div>
-                            """, unsafe_allow_html=True)
+                            """
+
+
+@fragment
+def render_danger_zone(data_manager: DataManager):
+    """Reset confirmation flow; reruns on its own while the admin steps through it"""
+    st.markdown(DANGER_ZONE_HTML, unsafe_allow_html=True)
+    
+    st.markdown("<br>", unsafe_allow_html=True)
+    
+    # Step 1: Show confirmation checkbox
+    confirm_reset = st.checkbox("I understand this will delete all data permanently", key="confirm_reset")
+    
+    if confirm_reset:
+        # Step 2: Type confirmation code
+        st.warning("Please type **DELETE ALL** to confirm:")
+        confirmation_code = st.text_input("Confirmation Code", placeholder="Type DELETE ALL here", key="reset_code")
+        
+        if confirmation_code == "DELETE ALL":
+            # Step 3: Final confirmation button
+            st.error("🔴 FINAL WARNING: This action is irreversible!")
+            
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                if st.button("🗑️ RESET APP", type="primary", use_container_width=True):
+                    try:
+                        # Store current admin username before reset
+                        current_admin = st.session_state.current_user
+                        
+                        # Clear all data and recreate defaults as one locked write
+                        with data_manager.batch():
+                            data_manager.employees = {}
+                            data_manager.users = {}
+                            data_manager.leave_requests = {}
+                            data_manager._reindex_leave_requests()
                             
-                            st.info("🔄 Reloading app...")
-                            time.sleep(2)
-                            st.rerun()
+                            # Delete data files (one unlink each; a missing file is fine)
+                            for file_path in [EMPLOYEES_FILE, USERS_FILE, DATA_FILE]:
+                                try:
+                                    os.remove(file_path)
+                                except OSError:
+                                    pass
                             
-                        except Exception as e:
-                            st.error(f"❌ Error during reset: {str(e)}")
-                
-                with col2:
-                    st.markdown("<br>", unsafe_allow_html=True)
-                    st.caption("Clicking this button will immediately erase all data")
-            elif confirmation_code and confirmation_code != "DELETE ALL":
-                st.error("❌ Incorrect confirmation code. Please type exactly: DELETE ALL")
+                            # Recreate fresh default data (the admin account comes back
+                            # with its default password, admin123)
+                            data_manager._create_sample_employees()
+                            data_manager._create_default_users()
+                        
+                        # Keep admin logged in
+                        st.session_state.current_user = "admin"
+                        st.session_state.user_role = "admin"
+                        st.session_state.employee_id = "EMP004"  # Admin's employee ID
+                        st.session_state.authenticated = True
+                        
+                        # Success message
+                        st.success("✅ Application has been reset successfully!")
+                        st.balloons()
+                        
+                        st.markdown(RESET_COMPLETE_HTML, unsafe_allow_html=True)
+                        
+                        st.info("🔄 Reloading app...")
+                        time.sleep(2)
+                        st.rerun()
+                        
+                    except Exception as e:
+                        st.error(f"❌ Error during reset: {str(e)}")
+            
+            with col2:
+                st.markdown("<br>", unsafe_allow_html=True)
+                st.caption("Clicking this button will immediately erase all data")
+        elif confirmation_code and confirmation_code != "DELETE ALL":
+            st.error("❌ Incorrect confirmation code. Please type exactly: DELETE ALL")
+
+
+@fragment
+def render_backup_export(data_manager: DataManager):
+    """Backup ZIP export; building and downloading it reruns only this block"""
+    st.markdown("**Export All Data**")
+    if st.button("📥 Download Backup JSON Files", use_container_width=True):
+        # Create a zip of all data files. Records are serialized lazily by
+        # _json_dumps (orjson when installed) and deflated at level 1: JSON text
+        # compresses nearly as well there at a fraction of the CPU cost
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zip_file:
+            # Add employees
+            if data_manager.employees:
+                zip_file.writestr('employees_backup.json', _json_dumps(data_manager.employees))
+            
+            # Add users
+            if data_manager.users:
+                zip_file.writestr('users_backup.json', _json_dumps(data_manager.users))
+            
+            # Add leave requests
+            if data_manager.leave_requests:
+                zip_file.writestr('leave_data_backup.json', _json_dumps(data_manager.leave_requests))
+        
+        st.download_button(
+            label="📦 Download ZIP Backup",
+            data=zip_buffer.getvalue(),
+            file_name=f"leave_system_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+            mime="application/zip",
+            use_container_width=True
+        )
+
+
+def render_settings(data_manager: DataManager):
+    """Render settings page with app reset functionality (Admin only)"""
+    st.header("⚙️ Settings")
+    
+    # Show current data stats
+    st.subheader("📊 Current Data Overview")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Total Employees", len(data_manager.employees))
+    with col2:
+        st.metric("Total Users", len(data_manager.users))
+    with col3:
+        st.metric("Leave Requests", len(data_manager.leave_requests))
+    with col4:
+        active_requests = data_manager.count_requests_by_status("Pending")
+        st.metric("Pending Requests", active_requests)
+    
+    st.markdown("---")
+    
+    # Danger Zone - Reset Application
+    st.subheader("🚨 Danger Zone")
+    
+    render_danger_zone(data_manager)
     
     st.markdown("---")
     
@@ -3509,37 +4401,7 @@ def render_settings(data_manager: DataManager):
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("**Export All Data**")
-        if st.button("📥 Download Backup JSON Files", use_container_width=True):
-            # Create a zip of all data files
-            import zipfile
-            import io
-            
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-                # Add employees
-                if data_manager.employees:
-                    emp_json = json.dumps({k: v.to_dict() for k, v in data_manager.employees.items()}, indent=2)
-                    zip_file.writestr('employees_backup.json', emp_json)
-                
-                # Add users
-                if data_manager.users:
-                    users_json = json.dumps({k: v.to_dict() for k, v in data_manager.users.items()}, indent=2)
-                    zip_file.writestr('users_backup.json', users_json)
-                
-                # Add leave requests
-                if data_manager.leave_requests:
-                    leaves_json = json.dumps({k: v.to_dict() for k, v in data_manager.leave_requests.items()}, indent=2)
-                    zip_file.writestr('leave_data_backup.json', leaves_json)
-            
-            zip_buffer.seek(0)
-            st.download_button(
-                label="📦 Download ZIP Backup",
-                data=zip_buffer.getvalue(),
-                file_name=f"leave_system_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
-                mime="application/zip",
-                use_container_width=True
-            )
+        render_backup_export(data_manager)
     
     with col2:
         st.markdown("**System Info**")
@@ -3552,6 +4414,67 @@ def render_settings(data_manager: DataManager):
         """)
 
 
+def render_employee_leave_page(data_manager: DataManager, calculator: LeaveCalculator):
+    """Leave request page for the logged-in employee"""
+    employee = data_manager.employees.get(st.session_state.employee_id)
+    if employee:
+        render_employee_leave_request(data_manager, calculator, employee)
+
+
+# Page renderers per role, keyed by sidebar entry (in menu order); each takes (data_manager, calculator)
+NAVIGATION_ROUTES = MappingProxyType({
+    "employee": MappingProxyType({
+        "🏠 My Dashboard": render_employee_dashboard,
+        "📝 Submit Leave Request": render_employee_leave_page,
+        "📖 UAE Entitlements": lambda dm, calc: render_leave_entitlements(),
+    }),
+    "admin": MappingProxyType({
+        "📊 Dashboard": lambda dm, calc: render_dashboard(dm),
+        "👥 Employees": lambda dm, calc: render_employee_management(dm),
+        "👤 User Management": lambda dm, calc: render_user_management(dm),
+        "✅ Approvals": lambda dm, calc: render_two_level_approvals(dm),
+        "📅 Calendar": lambda dm, calc: render_leave_calendar(dm),
+        "📖 UAE Entitlements": lambda dm, calc: render_leave_entitlements(),
+        "📊 Reports": lambda dm, calc: render_reports(dm),
+        "🔐 Change Password": lambda dm, calc: render_change_password(dm),
+        "⚙️ Settings": lambda dm, calc: render_settings(dm),
+    }),
+    "manager": MappingProxyType({
+        "📊 Dashboard": lambda dm, calc: render_dashboard(dm),
+        "👥 Employees": lambda dm, calc: render_employee_management(dm),
+        "✅ Final Approvals": lambda dm, calc: render_two_level_approvals(dm),
+        "📅 Calendar": lambda dm, calc: render_leave_calendar(dm),
+        "📖 UAE Entitlements": lambda dm, calc: render_leave_entitlements(),
+        "📊 Reports": lambda dm, calc: render_reports(dm),
+        "🔐 Change Password": lambda dm, calc: render_change_password(dm),
+    }),
+})
+# Sidebar navigation entries per role
+NAVIGATION_MENUS = MappingProxyType({role: tuple(routes) for role, routes in NAVIGATION_ROUTES.items()})
+DEFAULT_NAVIGATION_MENU = ("📊 Dashboard",)
+# Sidebar footer naming the logged-in user and their role
+SIDEBAR_IDENTITY_HTML = """
+        <div style="font-size: 12px; color: #aaaaaa;">
+            <strong style="color: #ffffff;">Logged in as:</strong><br>
+            {user}<br>
+            ({role})
+        </div>
+        """
+
+
+# Custom CSS for better visibility in both light and dark modes
+APP_CSS = """
+    <style>
+    .stMarkdown { color: inherit; }
+    .info-box { background-color: #1e3a5f; color: #ffffff; padding: 10px; border-radius: 5px; border-left: 4px solid #4a90d9; }
+    .warning-box { background-color: #5c3a00; color: #ffffff; padding: 10px; border-radius: 5px; border-left: 4px solid #ffa500; }
+    .error-box { background-color: #5c1a1a; color: #ffffff; padding: 10px; border-radius: 5px; border-left: 4px solid #ff4444; }
+    .success-box { background-color: #1a5c1a; color: #ffffff; padding: 10px; border-radius: 5px; border-left: 4px solid #44ff44; }
+    .css-1d391kg, .css-1lcbmhc { color: #fafafa; }
+    </style>
+    """
+
+
 def main():
     """Main application function with authentication"""
     st.set_page_config(
@@ -3561,17 +4484,7 @@ def main():
         initial_sidebar_state="expanded"
     )
     
-    # Custom CSS for better visibility in both light and dark modes
-    st.markdown("""
-    <style>
-    .stMarkdown { color: inherit; }
-    .info-box { background-color: #1e3a5f; color: #ffffff; padding: 10px; border-radius: 5px; border-left: 4px solid #4a90d9; }
-    .warning-box { background-color: #5c3a00; color: #ffffff; padding: 10px; border-radius: 5px; border-left: 4px solid #ffa500; }
-    .error-box { background-color: #5c1a1a; color: #ffffff; padding: 10px; border-radius: 5px; border-left: 4px solid #ff4444; }
-    .success-box { background-color: #1a5c1a; color: #ffffff; padding: 10px; border-radius: 5px; border-left: 4px solid #44ff44; }
-    .css-1d391kg, .css-1lcbmhc { color: #fafafa; }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(APP_CSS, unsafe_allow_html=True)
     
     init_session_state()
     data_manager = st.session_state.data_manager
@@ -3590,89 +4503,19 @@ def main():
         st.title("🇦🇪 Leave System")
         st.markdown("---")
         
-        if user_role == "employee":
-            menu = st.radio(
-                "Navigation",
-                ["🏠 My Dashboard", "📝 Submit Leave Request", "📖 UAE Entitlements"]
-            )
-        elif user_role == "admin":
-            menu = st.radio(
-                "Navigation",
-                ["📊 Dashboard", "👥 Employees", "👤 User Management", "✅ Approvals", 
-                 "📅 Calendar", "📖 UAE Entitlements", "📊 Reports", "🔐 Change Password", "⚙️ Settings"]
-            )
-        elif user_role == "manager":
-            menu = st.radio(
-                "Navigation",
-                ["📊 Dashboard", "👥 Employees", "✅ Final Approvals", 
-                 "📅 Calendar", "📖 UAE Entitlements", "📊 Reports", "🔐 Change Password"]
-            )
-        else:
-            menu = st.radio("Navigation", ["📊 Dashboard"])
+        menu = st.radio("Navigation", NAVIGATION_MENUS.get(user_role, DEFAULT_NAVIGATION_MENU))
         
         st.markdown("---")
-        st.markdown(f"""
-        <div style="font-size: 12px; color: #aaaaaa;">
-            <strong style="color: #ffffff;">Logged in as:</strong><br>
-            {st.session_state.current_user}<br>
-            ({USER_ROLES.get(user_role, user_role)})
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(SIDEBAR_IDENTITY_HTML.format(
+            user=st.session_state.current_user, role=USER_ROLES.get(user_role, user_role)
+        ), unsafe_allow_html=True)
     
     render_header()
     
     # Route based on role and menu selection
-    if user_role == "employee":
-        if menu == "🏠 My Dashboard":
-            render_employee_dashboard(data_manager, calculator)
-        elif menu == "📝 Submit Leave Request":
-            employee = data_manager.employees.get(st.session_state.employee_id)
-            if employee:
-                render_employee_leave_request(data_manager, calculator, employee)
-        elif menu == "📖 UAE Entitlements":
-            render_leave_entitlements()
-    
-    elif user_role == "admin":
-        if menu == "📊 Dashboard":
-            render_dashboard(data_manager)
-        elif menu == "👥 Employees":
-            render_employee_management(data_manager)
-        elif menu == "👤 User Management":
-            render_user_management(data_manager)
-        elif menu == "✅ Approvals":
-            render_two_level_approvals(data_manager)
-        elif menu == "📅 Calendar":
-            render_leave_calendar(data_manager)
-        elif menu == "📖 UAE Entitlements":
-            render_leave_entitlements()
-        elif menu == "📊 Reports":
-            render_reports(data_manager)
-        elif menu == "🔐 Change Password":
-            render_change_password(data_manager)
-        elif menu == "⚙️ Settings":
-            render_settings(data_manager)
-    
-    elif user_role == "manager":
-        if menu == "📊 Dashboard":
-            render_dashboard(data_manager)
-        elif menu == "👥 Employees":
-            render_employee_management(data_manager)
-        elif menu == "✅ Final Approvals":
-            render_two_level_approvals(data_manager)
-        elif menu == "📅 Calendar":
-            render_leave_calendar(data_manager)
-        elif menu == "📖 UAE Entitlements":
-            render_leave_entitlements()
-        elif menu == "📊 Reports":
-            render_reports(data_manager)
-        elif menu == "🔐 Change Password":
-            render_change_password(data_manager)
-    elif menu == "📅 Calendar":
-        render_leave_calendar(data_manager)
-    elif menu == "📖 UAE Entitlements":
-        render_leave_entitlements()
-    elif menu == "📊 Reports":
-        render_reports(data_manager)
+    page = NAVIGATION_ROUTES.get(user_role, {}).get(menu)
+    if page:
+        page(data_manager, calculator)
 
 
 if __name__ == "__main__":